@@ -0,0 +1,52 @@
+import asyncio
+import logging
+import os
+from typing import AsyncIterator
+from agent.career_metrics import attach_career_metrics
+from agent.graph import graph
+from models.search import BatchSearchInputState
+
+
+MAX_CONCURRENT_CANDIDATES = int(os.getenv("MAX_CONCURRENT_CANDIDATES", 8))
+
+
+async def search_batch(
+    batch: BatchSearchInputState,
+) -> AsyncIterator[dict]:
+    """Run the search graph for every profile in the batch against one job.
+
+    Candidates are scheduled on a shared semaphore and results are yielded
+    as soon as each candidate finishes, not in input order.
+    """
+    # One vectorized pass for the whole batch instead of one per candidate
+    await asyncio.to_thread(
+        attach_career_metrics,
+        [profile for profile in batch.profiles if profile.career_metrics is None],
+    )
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CANDIDATES)
+
+    async def run_candidate(index: int, search_input) -> dict:
+        result = {
+            "index": index,
+            "public_identifier": search_input.profile.public_identifier,
+        }
+        async with semaphore:
+            try:
+                result["output"] = await graph.ainvoke(search_input)
+            except Exception as e:
+                logging.exception(
+                    f"Batch search failed for {search_input.profile.public_identifier}"
+                )
+                result["error"] = str(e)
+        return result
+
+    tasks = [
+        asyncio.create_task(run_candidate(index, search_input))
+        for index, search_input in enumerate(batch.to_search_inputs())
+    ]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
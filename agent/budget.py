@@ -0,0 +1,228 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+from services.llms import llm_call_site
+from services.metrics import llm_tokens_total
+
+# Budgets of requests that failed before compile_sources released them are
+# dropped oldest first past this many
+MAX_TRACKED_REQUESTS = 10000
+
+
+class RequestBudget(BaseCallbackHandler):
+    """Deadline, LLM call and token limits of one request, and its token usage.
+
+    While a node runs inside `use_budget`, every chat model call it makes
+    (fallbacks and hedged calls included) is counted against the budget
+    through LangChain's callbacks. Work that is about to call a model first
+    reserves the call with `try_reserve_llm_call`, which counts it up front so
+    concurrent branches can't all pass the check. Reservations no model call
+    used (a heuristic rejected the source, or the LLM cache answered) are
+    given back when the `use_budget` block ends. The call and token limits are
+    only checked before starting new work, so calls already in flight when
+    one is hit still complete. The deadline also cancels work still running
+    when it passes.
+
+    The same callbacks add up the input, output and cached input tokens and
+    the time of every call by call site, which `usage_report` returns.
+    """
+
+    def __init__(
+        self,
+        deadline_ms: Optional[int] = None,
+        max_llm_calls: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ):
+        self.started_at = time.monotonic()
+        self.deadline_at = (
+            self.started_at + deadline_ms / 1000 if deadline_ms is not None else None
+        )
+        self.max_llm_calls = max_llm_calls
+        self.max_tokens = max_tokens
+        self.llm_calls = 0
+        self.tokens = 0
+        self.skipped: list[dict] = []
+        self.usage: dict[str, dict] = {}
+        self._started: dict = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs) -> None:
+        prepaid = _prepaid_llm_calls.get()
+        with self._lock:
+            if prepaid and prepaid[0] > 0:
+                prepaid[0] -= 1
+            else:
+                self.llm_calls += 1
+            self._started[run_id] = (llm_call_site.get(), time.monotonic())
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        call_usage = {"input_tokens": 0, "output_tokens": 0, "cached_tokens": 0}
+        total_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(
+                    getattr(generation, "message", None), "usage_metadata", None
+                )
+                if usage:
+                    total_tokens += usage.get("total_tokens", 0)
+                    call_usage["input_tokens"] += usage.get("input_tokens", 0)
+                    call_usage["output_tokens"] += usage.get("output_tokens", 0)
+                    call_usage["cached_tokens"] += (
+                        usage.get("input_token_details") or {}
+                    ).get("cache_read", 0)
+
+        with self._lock:
+            self.tokens += total_tokens
+            call_site, started_at = self._started.pop(
+                run_id, (llm_call_site.get(), None)
+            )
+            call_site = call_site or "unknown"
+            site_usage = self.usage.setdefault(
+                call_site,
+                {
+                    "calls": 0,
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                    "cached_tokens": 0,
+                    "total_tokens": 0,
+                    "seconds": 0.0,
+                },
+            )
+            site_usage["calls"] += 1
+            site_usage["total_tokens"] += total_tokens
+            for key, value in call_usage.items():
+                site_usage[key] += value
+            if started_at is not None:
+                site_usage["seconds"] += time.monotonic() - started_at
+
+        for kind, key in (
+            ("input", "input_tokens"),
+            ("output", "output_tokens"),
+            ("cached", "cached_tokens"),
+        ):
+            if call_usage[key]:
+                llm_tokens_total.labels(call_site, kind).inc(call_usage[key])
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        with self._lock:
+            self._started.pop(run_id, None)
+
+    def remaining_seconds(self) -> Optional[float]:
+        """Seconds until the deadline, or None without one."""
+        if self.deadline_at is None:
+            return None
+        return max(0.0, self.deadline_at - time.monotonic())
+
+    def exhausted(self) -> Optional[str]:
+        """The limit that has been reached, or None if there is budget left."""
+        if self.deadline_at is not None and time.monotonic() >= self.deadline_at:
+            return "deadline"
+        if self.max_llm_calls is not None and self.llm_calls >= self.max_llm_calls:
+            return "max_llm_calls"
+        if self.max_tokens is not None and self.tokens >= self.max_tokens:
+            return "max_tokens"
+        return None
+
+    def try_reserve_llm_call(self) -> Optional[str]:
+        """Count the next LLM call made in this context ahead of time.
+
+        Returns the limit that has been reached instead if there is no budget
+        left. Must be called inside `use_budget`.
+        """
+        with self._lock:
+            reason = self.exhausted()
+            if reason is None:
+                self.llm_calls += 1
+                _prepaid_llm_calls.get()[0] += 1
+        return reason
+
+    def release_unused_llm_calls(self) -> None:
+        """Give back the calls reserved in this context that no model call used."""
+        prepaid = _prepaid_llm_calls.get()
+        with self._lock:
+            if prepaid and prepaid[0] > 0:
+                self.llm_calls -= prepaid[0]
+                prepaid[0] = 0
+
+    def usage_report(self) -> dict:
+        """Token usage of the request so far, in total and per call site,
+        call sites using the most tokens first."""
+        with self._lock:
+            by_call_site = {
+                call_site: {**usage, "seconds": round(usage["seconds"], 3)}
+                for call_site, usage in sorted(
+                    self.usage.items(),
+                    key=lambda item: item[1]["total_tokens"],
+                    reverse=True,
+                )
+            }
+        total = {
+            key: sum(usage[key] for usage in by_call_site.values())
+            for key in (
+                "calls",
+                "input_tokens",
+                "output_tokens",
+                "cached_tokens",
+                "total_tokens",
+            )
+        }
+        return {"total": total, "by_call_site": by_call_site}
+
+    def skip(self, stage: str, reason: str, **details) -> None:
+        """Record work that was not done because of `reason`."""
+        with self._lock:
+            self.skipped.append({"stage": stage, "reason": reason, **details})
+
+
+_budgets: OrderedDict[str, RequestBudget] = OrderedDict()
+_budgets_lock = threading.Lock()
+_current_budget: ContextVar[Optional[RequestBudget]] = ContextVar(
+    "current_budget", default=None
+)
+# Calls reserved by try_reserve_llm_call that the callbacks haven't seen yet
+_prepaid_llm_calls: ContextVar[Optional[list[int]]] = ContextVar(
+    "prepaid_llm_calls", default=None
+)
+register_configure_hook(_current_budget, inheritable=True)
+
+
+def start_budget(request_id: str, **limits) -> RequestBudget:
+    """Create the budget of a request when it starts."""
+    budget = RequestBudget(**limits)
+    with _budgets_lock:
+        _budgets[request_id] = budget
+        while len(_budgets) > MAX_TRACKED_REQUESTS:
+            _budgets.popitem(last=False)
+    return budget
+
+
+def get_budget(request_id: str) -> RequestBudget:
+    """Budget of a running request, or an unlimited one if it is unknown."""
+    with _budgets_lock:
+        budget = _budgets.get(request_id)
+    return budget if budget is not None else RequestBudget()
+
+
+def release_budget(request_id: str) -> RequestBudget:
+    """Stop tracking a request and return its final budget."""
+    with _budgets_lock:
+        budget = _budgets.pop(request_id, None)
+    return budget if budget is not None else RequestBudget()
+
+
+@contextmanager
+def use_budget(budget: RequestBudget):
+    """Count the LLM calls made inside the block against `budget`."""
+    token = _current_budget.set(budget)
+    prepaid_token = _prepaid_llm_calls.set([0])
+    try:
+        yield budget
+    finally:
+        budget.release_unused_llm_calls()
+        _prepaid_llm_calls.reset(prepaid_token)
+        _current_budget.reset(token)
@@ -0,0 +1,428 @@
+"""Career metrics computed for many profiles at once.
+
+Tenure arithmetic runs on flat NumPy arrays holding every experience of the
+batch, with dates as month numbers (year * 12 + month - 1). Only per-company
+lookups (funding stage at a date, tiers, tech stack keywords) touch the
+individual experiences.
+"""
+
+from datetime import date
+import numpy as np
+from agent.text_utils import clean_text
+from models.career import (
+    CareerMetrics,
+    CompanyTier,
+    ExperienceStageMetrics,
+    FundingType,
+    KeywordMatcher,
+    TechStack,
+    TechStackPatterns,
+    UniversityTier,
+)
+from models.linkedin import LinkedInExperience, LinkedInProfile
+
+BIG_TECH_COMPANIES = {
+    "alphabet",
+    "amazon",
+    "apple",
+    "facebook",
+    "google",
+    "meta",
+    "microsoft",
+    "netflix",
+    "nvidia",
+}
+EARLY_STAGES = {
+    FundingType.ANGEL,
+    FundingType.CONVERTIBLE_NOTE,
+    FundingType.EQUITY_CROWDFUNDING,
+    FundingType.GRANT,
+    FundingType.NON_EQUITY,
+    FundingType.PRE_SEED,
+    FundingType.PRODUCT_CROWDFUNDING,
+    FundingType.SEED,
+}
+GROWTH_STAGES = {
+    FundingType.PRIVATE_EQUITY,
+    FundingType.SECONDARY_MARKET,
+    FundingType.SERIES_C,
+    FundingType.SERIES_D,
+    FundingType.SERIES_E,
+    FundingType.SERIES_F,
+    FundingType.SERIES_G,
+    FundingType.SERIES_H,
+    FundingType.SERIES_I,
+    FundingType.SERIES_J,
+}
+PUBLIC_STAGES = {
+    FundingType.POST_IPO_DEBT,
+    FundingType.POST_IPO_EQUITY,
+    FundingType.POST_IPO_SECONDARY,
+}
+
+# Best tier first; schools are matched on their cleaned full name
+UNIVERSITY_TIERS = {
+    UniversityTier.TOP_5: {
+        "massachusetts institute of technology",
+        "mit",
+        "stanford university",
+        "harvard university",
+        "california institute of technology",
+        "university of california berkeley",
+        "uc berkeley",
+    },
+    UniversityTier.TOP_10: {
+        "carnegie mellon university",
+        "princeton university",
+        "university of oxford",
+        "university of cambridge",
+        "yale university",
+    },
+    UniversityTier.TOP_20: {
+        "columbia university",
+        "cornell university",
+        "eth zurich",
+        "imperial college london",
+        "university of chicago",
+        "university of pennsylvania",
+        "university of california los angeles",
+        "ucla",
+        "university of toronto",
+        "university of washington",
+    },
+    UniversityTier.TOP_50: {
+        "duke university",
+        "epfl",
+        "georgia institute of technology",
+        "johns hopkins university",
+        "national university of singapore",
+        "new york university",
+        "northwestern university",
+        "peking university",
+        "tsinghua university",
+        "university of illinois urbana champaign",
+        "university of michigan",
+        "university of texas at austin",
+        "university of waterloo",
+    },
+}
+
+# Lowest first; a title takes the highest level any of its keywords maps to
+EXPERIENCE_LEVELS = [
+    ("Intern", {"intern", "internship"}),
+    ("Junior", {"junior", "jr", "associate", "graduate", "entry level"}),
+    ("Mid", set()),
+    ("Senior", {"senior", "sr"}),
+    ("Staff", {"staff"}),
+    ("Principal", {"principal", "distinguished", "fellow"}),
+    ("Manager", {"manager", "team lead"}),
+    ("Director", {"director", "head"}),
+    ("VP", {"vp", "vice president", "svp", "evp"}),
+    ("C-Level", {"chief", "ceo", "cto", "cfo", "coo", "cpo"}),
+    ("Founder", {"founder", "co-founder", "cofounder"}),
+]
+LEVEL_RANK = {level: rank for rank, (level, _) in enumerate(EXPERIENCE_LEVELS)}
+DEFAULT_LEVEL = "Mid"
+LEADERSHIP_RANK = LEVEL_RANK["Manager"]
+
+JOB_HOPPER_MIN_EXPERIENCES = 3
+JOB_HOPPER_MAX_AVERAGE_TENURE_MONTHS = 18
+LONG_TENURE_MIN_AVERAGE_MONTHS = 48
+
+_level_matcher = KeywordMatcher(
+    {keyword: {level} for level, keywords in EXPERIENCE_LEVELS for keyword in keywords}
+)
+
+
+def to_month(value: date) -> int:
+    return value.year * 12 + value.month - 1
+
+
+def get_experience_level(title: str | None) -> str:
+    """Seniority of a job title, e.g. "Senior" for "Sr. Software Engineer"."""
+    levels = _level_matcher.match(title or "")
+    return max(levels, key=LEVEL_RANK.get) if levels else DEFAULT_LEVEL
+
+
+def get_company_tier(
+    experience: LinkedInExperience, funding_stage: FundingType
+) -> CompanyTier | None:
+    """Tier of the company when the candidate joined, None if unknown."""
+    if clean_text(experience.company or "").strip() in BIG_TECH_COMPANIES:
+        return CompanyTier.BIG_TECH
+    company = experience.company_data
+    if funding_stage in PUBLIC_STAGES or (
+        funding_stage == FundingType.UNKNOWN
+        and company is not None
+        and (company.ipo_status or "").lower() == "public"
+    ):
+        return CompanyTier.ENTERPRISE
+    if funding_stage in GROWTH_STAGES:
+        return CompanyTier.GROWTH
+    if funding_stage == FundingType.UNKNOWN:
+        return None
+    return CompanyTier.STARTUP
+
+
+def get_university_tier(school: str | None) -> UniversityTier:
+    name = " ".join(clean_text(school or "").split())
+    for tier, schools in UNIVERSITY_TIERS.items():
+        if name in schools:
+            return tier
+    return UniversityTier.OTHER
+
+
+def get_experience_stage_metrics(
+    experience: LinkedInExperience, duration_months: int
+) -> ExperienceStageMetrics | None:
+    """Funding stage and tier of the company when the candidate joined it."""
+    if experience.starts_at is None or experience.company_data is None:
+        return None
+    funding_stage = experience.company_data.get_funding_stage_at_date(
+        experience.starts_at
+    )
+    company_tier = get_company_tier(experience, funding_stage)
+    if company_tier is None:
+        return None
+    return ExperienceStageMetrics(
+        company_name=experience.company or experience.company_data.name,
+        funding_stage=funding_stage,
+        joined_at=experience.starts_at,
+        left_at=experience.ends_at,
+        duration_months=duration_months,
+        company_tier=company_tier,
+    )
+
+
+def get_experience_tags(
+    experience: LinkedInExperience, stage_metrics: ExperienceStageMetrics, as_of: date
+) -> list[str]:
+    tags = [f"{stage_metrics.company_tier.value} Experience"]
+    if stage_metrics.funding_stage in EARLY_STAGES:
+        tags.append("Early Stage Experience")
+    if experience.company_data.get_funding_rounds_between_dates(
+        stage_metrics.joined_at, stage_metrics.left_at or as_of
+    ):
+        tags.append("Funding Round During Tenure")
+    return tags
+
+
+def _tenure_arrays(
+    profiles: list[LinkedInProfile], as_of: date
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Profile index, start month, end month and current flag of every dated
+    experience, sorted by profile then start month."""
+    as_of_month = to_month(as_of)
+    experiences = [
+        experience for profile in profiles for experience in profile.experiences
+    ]
+    profile_index = np.repeat(
+        np.arange(len(profiles)),
+        np.fromiter((len(profile.experiences) for profile in profiles), np.int64),
+    )
+    # Unrolled month numbers: converting dates with NumPy is several times slower
+    starts = np.fromiter(
+        (
+            e.starts_at.year * 12 + e.starts_at.month - 1 if e.starts_at else -1
+            for e in experiences
+        ),
+        np.int64,
+        count=len(experiences),
+    )
+    ends = np.fromiter(
+        (
+            e.ends_at.year * 12 + e.ends_at.month - 1 if e.ends_at else -1
+            for e in experiences
+        ),
+        np.int64,
+        count=len(experiences),
+    )
+
+    dated = starts >= 0
+    profile_index, starts, ends = profile_index[dated], starts[dated], ends[dated]
+    current = ends < 0
+    starts = np.minimum(starts, as_of_month)
+    ends = np.maximum(
+        np.where(current, as_of_month, np.minimum(ends, as_of_month)), starts
+    )
+
+    order = np.lexsort((starts, profile_index))
+    profile_index, starts, ends, current = (
+        profile_index[order],
+        starts[order],
+        ends[order],
+        current[order],
+    )
+    return profile_index, starts, ends, current
+
+
+def compute_tenure_metrics(
+    profiles: list[LinkedInProfile], as_of: date | None = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Total, average and current tenure in months of every profile.
+
+    Months are counted inclusively, so a role held within one month lasts one
+    month. The total counts overlapping roles once. Profiles without dated
+    experiences get -1, and those without a current role get -1 as their
+    current tenure.
+    """
+    as_of = as_of or date.today()
+    n = len(profiles)
+    profile_index, starts, ends, current = _tenure_arrays(profiles, as_of)
+    durations = ends - starts + 1
+
+    counts = np.bincount(profile_index, minlength=n)
+    average = np.full(n, -1, dtype=np.int64)
+    has_experience = counts > 0
+    average[has_experience] = np.round(
+        np.bincount(profile_index, weights=durations, minlength=n)[has_experience]
+        / counts[has_experience]
+    )
+
+    # Union of each profile's intervals. Months are capped at `as_of`, so
+    # shifting every profile past the previous one's months lets one running
+    # maximum over the sorted intervals serve all profiles
+    offset = profile_index * (to_month(as_of) + 1)
+    starts, ends = starts + offset, ends + offset
+    covered_until = np.concatenate(([-1], np.maximum.accumulate(ends)[:-1]))
+    new_months = np.maximum(0, ends - np.maximum(starts - 1, covered_until))
+    total = np.full(n, -1, dtype=np.int64)
+    total[has_experience] = np.bincount(profile_index, weights=new_months, minlength=n)[
+        has_experience
+    ]
+
+    current_tenure = np.full(n, -1, dtype=np.int64)
+    np.maximum.at(current_tenure, profile_index[current], durations[current])
+
+    return total, average, current_tenure
+
+
+def compute_career_metrics(
+    profiles: list[LinkedInProfile], as_of: date | None = None
+) -> list[CareerMetrics]:
+    """Career metrics of every profile, computed for the batch at once."""
+    return [metrics for metrics, _ in _compute_career_metrics(profiles, as_of)]
+
+
+def attach_career_metrics(
+    profiles: list[LinkedInProfile], as_of: date | None = None
+) -> list[LinkedInProfile]:
+    """Fill in `career_metrics` of every profile, and `experience_tags` of
+    their experiences."""
+    for profile, (metrics, experience_tags) in zip(
+        profiles, _compute_career_metrics(profiles, as_of)
+    ):
+        profile.career_metrics = metrics
+        for experience, tags in zip(profile.experiences, experience_tags):
+            experience.experience_tags = tags
+    return profiles
+
+
+def _compute_career_metrics(
+    profiles: list[LinkedInProfile], as_of: date | None
+) -> list[tuple[CareerMetrics, list[list[str] | None]]]:
+    """Metrics of every profile with the tags of each of its experiences."""
+    as_of = as_of or date.today()
+    total, average, current_tenure = compute_tenure_metrics(profiles, as_of)
+
+    experiences = [
+        experience for profile in profiles for experience in profile.experiences
+    ]
+    tech_stacks = TechStackPatterns.detect_tech_stacks_batch(
+        [_experience_text(experience) for experience in experiences]
+    )
+
+    metrics = []
+    position = 0
+    for profile_index, profile in enumerate(profiles):
+        profile_stacks = set()
+        tags_by_experience = []
+        levels = []
+        for experience in profile.experiences:
+            profile_stacks |= tech_stacks[position]
+            position += 1
+            levels.append(get_experience_level(experience.title))
+
+            stage_metrics = None
+            if experience.starts_at is not None:
+                end = min(experience.ends_at or as_of, as_of)
+                duration = max(to_month(end) - to_month(experience.starts_at), 0) + 1
+                stage_metrics = get_experience_stage_metrics(experience, duration)
+            tags_by_experience.append(
+                get_experience_tags(experience, stage_metrics, as_of)
+                if stage_metrics is not None
+                else None
+            )
+
+        experience_tags = [
+            tag for tags in tags_by_experience if tags is not None for tag in tags
+        ]
+        career_metrics = CareerMetrics(
+            total_experience_months=_optional(total[profile_index]),
+            average_tenure_months=_optional(average[profile_index]),
+            current_tenure_months=_optional(current_tenure[profile_index]),
+            tech_stacks=[stack.value for stack in TechStack if stack in profile_stacks],
+            career_tags=_career_tags(profile, levels, average[profile_index]),
+            experience_tags=list(dict.fromkeys(experience_tags)),
+            latest_experience_level=_latest_level(profile, levels),
+        )
+        metrics.append((career_metrics, tags_by_experience))
+    return metrics
+
+
+def _experience_text(experience: LinkedInExperience) -> str:
+    parts = [experience.title or "", experience.description or ""]
+    if experience.summarized_job_description:
+        parts.extend(experience.summarized_job_description.skills)
+    return "\n".join(parts)
+
+
+def _optional(value: np.int64) -> int | None:
+    return int(value) if value >= 0 else None
+
+
+def _latest_level(profile: LinkedInProfile, levels: list[str]) -> str | None:
+    """Level of the current role, or of the most recently started one."""
+    dated = [
+        index
+        for index, experience in enumerate(profile.experiences)
+        if experience.starts_at is not None
+    ]
+    if not dated:
+        return levels[0] if levels else None
+    # max keeps the first of equal keys, and profiles list their newest roles first
+    latest = max(
+        dated,
+        key=lambda index: (
+            profile.experiences[index].ends_at is None,
+            profile.experiences[index].starts_at,
+        ),
+    )
+    return levels[latest]
+
+
+def _career_tags(
+    profile: LinkedInProfile, levels: list[str], average_tenure: int
+) -> list[str]:
+    tags = []
+    if "Founder" in levels:
+        tags.append("Founder")
+    if any(LEVEL_RANK[level] >= LEADERSHIP_RANK for level in levels):
+        tags.append("Leadership Experience")
+    if 0 <= average_tenure:
+        if (
+            len(profile.experiences) >= JOB_HOPPER_MIN_EXPERIENCES
+            and average_tenure < JOB_HOPPER_MAX_AVERAGE_TENURE_MONTHS
+        ):
+            tags.append("Job Hopper")
+        elif average_tenure >= LONG_TENURE_MIN_AVERAGE_MONTHS:
+            tags.append("Long Tenure")
+
+    university_tier = min(
+        (get_university_tier(education.school) for education in profile.education),
+        key=list(UniversityTier).index,
+        default=UniversityTier.OTHER,
+    )
+    if university_tier != UniversityTier.OTHER:
+        tags.append(f"{university_tier.value} University")
+    return tags
@@ -0,0 +1,40 @@
+import asyncio
+import os
+import weakref
+from contextlib import asynccontextmanager
+
+
+MAX_CONCURRENT_LLM_CALLS = int(os.getenv("MAX_CONCURRENT_LLM_CALLS", 64))
+
+_process_semaphore: asyncio.Semaphore | None = None
+
+# Semaphores are only kept alive while a branch of the request holds or waits
+# on them; once none does, a fresh one has the same effect.
+_request_semaphores: weakref.WeakValueDictionary[str, asyncio.Semaphore] = (
+    weakref.WeakValueDictionary()
+)
+
+
+def get_process_semaphore() -> asyncio.Semaphore:
+    """Semaphore shared by every request handled by this process."""
+    global _process_semaphore
+    if _process_semaphore is None:
+        _process_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM_CALLS)
+    return _process_semaphore
+
+
+def get_request_semaphore(request_id: str, limit: int) -> asyncio.Semaphore:
+    """Semaphore shared by the fan-out branches of a single request."""
+    semaphore = _request_semaphores.get(request_id)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(limit)
+        _request_semaphores[request_id] = semaphore
+    return semaphore
+
+
+@asynccontextmanager
+async def llm_slot(request_id: str, request_limit: int):
+    """Hold a slot in both the per-request and the per-process limits."""
+    async with get_request_semaphore(request_id, request_limit):
+        async with get_process_semaphore():
+            yield
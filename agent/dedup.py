@@ -0,0 +1,151 @@
+import heapq
+import os
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from agent.text_utils import clean_text
+
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", 0.8))
+MINHASH_SIZE = 128
+SHINGLE_SIZE = 5
+# Shorter pages (logins, cookie walls, error pages) look alike without being
+# the same source, so they are only deduplicated by URL
+MIN_WORDS_FOR_NEAR_DUPLICATE = 50
+# Long pages are compared on their first words only, which bounds the cost
+MAX_WORDS_FOR_NEAR_DUPLICATE = 10000
+
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "ref",
+    "ref_src",
+    "ref_url",
+    "referrer",
+    "si",
+    "trk",
+    "trackingid",
+    "_hsenc",
+    "_hsmi",
+}
+HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so variants of the same page compare equal.
+
+    Drops the scheme, fragment, tracking parameters, `www.`/mobile/AMP host
+    prefixes, a trailing `/amp` and trailing slashes, and sorts the remaining
+    query parameters.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix) :]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path
+    if path.endswith("/amp") or path.endswith("/amp/"):
+        path = path.rstrip("/")[: -len("/amp")]
+    path = path.rstrip("/")
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    canonical_url = f"{host}{path}"
+    if query:
+        canonical_url += f"?{urlencode(query)}"
+    return canonical_url
+
+
+def minhash_signature(text: str) -> list[int]:
+    """Bottom-k MinHash sketch of the text's word shingles.
+
+    Each shingle is hashed once and the MINHASH_SIZE smallest hashes are kept,
+    which estimates Jaccard similarity like k independent hash functions at a
+    fraction of the cost. Returns an empty sketch for short texts. Uses the
+    built-in string hash, which is salted per process, so sketches are only
+    comparable within one process.
+    """
+    words = clean_text(text).split()[:MAX_WORDS_FOR_NEAR_DUPLICATE]
+    if len(words) < MIN_WORDS_FOR_NEAR_DUPLICATE:
+        return []
+    shingles = {
+        " ".join(words[i : i + SHINGLE_SIZE])
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+    return heapq.nsmallest(MINHASH_SIZE, {hash(shingle) for shingle in shingles})
+
+
+def estimate_similarity(a: list[int], b: list[int]) -> float:
+    """Estimated Jaccard similarity of the texts behind two sketches."""
+    if not a or not b:
+        return 0.0
+    a_hashes, b_hashes = set(a), set(b)
+    union = heapq.nsmallest(MINHASH_SIZE, a_hashes | b_hashes)
+    shared = sum(1 for h in union if h in a_hashes and h in b_hashes)
+    return shared / len(union)
+
+
+def collapse_duplicate_sources(
+    sources: list[dict], threshold: float = NEAR_DUPLICATE_THRESHOLD
+) -> dict[str, dict]:
+    """Collapse sources that share a canonical URL or near-identical content.
+
+    The first source of each cluster, in search order, is kept and the URLs of
+    the others are recorded in its `aliases`. Job description and other
+    sources are never merged with each other since they are validated
+    differently. Returns the representatives keyed by URL.
+    """
+    by_canonical_url: dict[tuple[bool, str], dict] = {}
+    for source in sources:
+        key = (
+            bool(source.get("is_job_description")),
+            canonicalize_url(source["url"]),
+        )
+        representative = by_canonical_url.get(key)
+        if representative is None:
+            by_canonical_url[key] = {**source, "aliases": []}
+        elif representative["raw_content"] is None and source["raw_content"]:
+            # Keep the variant whose content could be fetched
+            by_canonical_url[key] = {**source, "aliases": []}
+            _add_alias(by_canonical_url[key], representative["url"])
+            for alias in representative["aliases"]:
+                _add_alias(by_canonical_url[key], alias)
+        else:
+            _add_alias(representative, source["url"])
+
+    representatives: list[tuple[dict, list[int]]] = []
+    for source in by_canonical_url.values():
+        signature = minhash_signature(source["raw_content"] or "")
+        duplicate_of = next(
+            (
+                representative
+                for representative, representative_signature in representatives
+                if representative.get("is_job_description")
+                == source.get("is_job_description")
+                and estimate_similarity(signature, representative_signature)
+                >= threshold
+            ),
+            None,
+        )
+        if duplicate_of is None:
+            representatives.append((source, signature))
+        else:
+            _add_alias(duplicate_of, source["url"])
+            for alias in source["aliases"]:
+                _add_alias(duplicate_of, alias)
+
+    return {source["url"]: source for source, _ in representatives}
+
+
+def _add_alias(source: dict, url: str) -> None:
+    if url != source["url"] and url not in source["aliases"]:
+        source["aliases"].append(url)
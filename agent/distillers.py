@@ -10,7 +10,9 @@ def distill_job_description(
     raw_content: str, role_query: str
 ) -> JobDescriptionDistillOutput:
     """Extract skills, requirements and summary from a job description."""
-    structured_llm = llm_fast.with_structured_output(JobDescriptionDistillOutput)
+    structured_llm = llm_fast.with_structured_output(
+        JobDescriptionDistillOutput, cache_site="distill_job_description"
+    )
     output = structured_llm.invoke(
         [
             SystemMessage(
@@ -25,10 +27,14 @@ def distill_job_description(
 
 
 @traceable(name="distill_human")
-def distill_human(raw_content: str, candidate_full_name: str) -> DistillSourceOutput:
+async def distill_human(
+    raw_content: str, candidate_full_name: str
+) -> DistillSourceOutput:
     """Extract relevant information about a person from raw content."""
-    structured_llm = llm_fast.with_structured_output(DistillSourceOutput)
-    output = structured_llm.invoke(
+    structured_llm = llm_fast.with_structured_output(
+        DistillSourceOutput, cache_site="distill_human"
+    )
+    output = await structured_llm.ainvoke(
         [
             SystemMessage(
                 content=distill_source_prompt.format(
@@ -42,7 +48,7 @@ def distill_human(raw_content: str, candidate_full_name: str) -> DistillSourceOu
 
 
 @traceable(name="distill_source")
-def distill_source(
+async def distill_source(
     raw_content: str,
     is_job_description: bool,
     candidate_full_name: str = None,
@@ -55,5 +61,5 @@ def distill_source(
     else:
         if not candidate_full_name:
             return ""
-        result = distill_human(raw_content, candidate_full_name)
+        result = await distill_human(raw_content, candidate_full_name)
         return result.distilled_source
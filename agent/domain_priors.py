@@ -0,0 +1,158 @@
+import os
+import random
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+from agent.dedup import HOST_PREFIXES
+
+DOMAIN_PRIOR_MIN_YIELD = float(os.getenv("DOMAIN_PRIOR_MIN_YIELD", 0.05))
+DOMAIN_PRIOR_MIN_SAMPLES = int(os.getenv("DOMAIN_PRIOR_MIN_SAMPLES", 50))
+DOMAIN_PRIOR_EXPLORATION_RATE = float(os.getenv("DOMAIN_PRIOR_EXPLORATION_RATE", 0.1))
+
+
+class DomainPriorStore:
+    """Counts accepted and rejected sources per domain in SQLite.
+
+    Job description and other sources are counted separately, since a domain
+    like a job board can be a good source for one and a poor one for the
+    other.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS domain_outcomes ("
+            "domain TEXT NOT NULL, "
+            "is_job_description INTEGER NOT NULL, "
+            "accepted INTEGER NOT NULL DEFAULT 0, "
+            "rejected INTEGER NOT NULL DEFAULT 0, "
+            "updated_at REAL NOT NULL, "
+            "PRIMARY KEY (domain, is_job_description))"
+        )
+        self._conn.commit()
+
+    def record(self, domain: str, is_job_description: bool, accepted: bool) -> None:
+        """Count one validation outcome for a domain."""
+        column = "accepted" if accepted else "rejected"
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO domain_outcomes "
+                f"(domain, is_job_description, {column}, updated_at) "
+                "VALUES (?, ?, 1, ?) "
+                "ON CONFLICT (domain, is_job_description) DO UPDATE SET "
+                f"{column} = {column} + 1, updated_at = excluded.updated_at",
+                (domain, int(is_job_description), time.time()),
+            )
+            self._conn.commit()
+
+    def counts(
+        self, domains: list[str], is_job_description: bool
+    ) -> dict[str, tuple[int, int]]:
+        """(accepted, rejected) for each of `domains` that has been seen."""
+        if not domains:
+            return {}
+        placeholders = ",".join("?" for _ in domains)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT domain, accepted, rejected FROM domain_outcomes "
+                f"WHERE is_job_description = ? AND domain IN ({placeholders})",
+                (int(is_job_description), *domains),
+            ).fetchall()
+        return {domain: (accepted, rejected) for domain, accepted, rejected in rows}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM domain_outcomes")
+            self._conn.commit()
+
+
+domain_prior_store = (
+    DomainPriorStore(os.getenv("DOMAIN_PRIORS_PATH", ".cache/domain_priors.sqlite3"))
+    if os.getenv("DOMAIN_PRIORS_ENABLED", "true").lower() == "true"
+    else None
+)
+
+
+def source_domain(url: str) -> str:
+    """Host of a URL without `www.` or mobile prefixes."""
+    host = (urlsplit(url).hostname or "").lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            return host[len(prefix) :]
+    return host
+
+
+def domain_yield(accepted: int, rejected: int) -> float:
+    """Acceptance rate with one pseudo-accept and one pseudo-reject, so
+    domains seen a few times stay close to even odds."""
+    return (accepted + 1) / (accepted + rejected + 2)
+
+
+def record_source_outcome(source: dict, accepted: bool) -> None:
+    """Count whether a validated source was accepted towards its domain's prior."""
+    if domain_prior_store is None:
+        return
+    domain_prior_store.record(
+        source_domain(source["url"]), source["is_job_description"], accepted
+    )
+
+
+def prioritize_sources(
+    sources: dict[str, dict],
+    min_yield: float = DOMAIN_PRIOR_MIN_YIELD,
+    min_samples: int = DOMAIN_PRIOR_MIN_SAMPLES,
+    exploration_rate: float = DOMAIN_PRIOR_EXPLORATION_RATE,
+) -> tuple[list[str], list[str]]:
+    """Order source URLs by their domain's acceptance rate, highest first.
+
+    Sources from domains with at least `min_samples` outcomes and a yield
+    below `min_yield` are dropped, except for a random `exploration_rate`
+    share of them, which are validated last so a domain that got better can
+    recover. Ties keep their incoming order. Returns the kept and the dropped
+    URLs.
+    """
+    if domain_prior_store is None:
+        return list(sources), []
+
+    priors = {}
+    for is_job_description in (False, True):
+        domains = list(
+            {
+                source_domain(url)
+                for url, source in sources.items()
+                if bool(source["is_job_description"]) == is_job_description
+            }
+        )
+        for domain, (accepted, rejected) in domain_prior_store.counts(
+            domains, is_job_description
+        ).items():
+            priors[(domain, is_job_description)] = (accepted, rejected)
+
+    def prior(url: str) -> tuple[float, int]:
+        key = (source_domain(url), bool(sources[url]["is_job_description"]))
+        accepted, rejected = priors.get(key, (0, 0))
+        return domain_yield(accepted, rejected), accepted + rejected
+
+    kept = []
+    skipped = []
+    for url in sources:
+        estimate, samples = prior(url)
+        if (
+            samples >= min_samples
+            and estimate < min_yield
+            and random.random() >= exploration_rate
+        ):
+            skipped.append(url)
+            continue
+        kept.append((url, estimate))
+    kept = [url for url, _ in sorted(kept, key=lambda item: item[1], reverse=True)]
+    return kept, skipped
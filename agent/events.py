@@ -0,0 +1,12 @@
+from langgraph.config import get_stream_writer
+from models.search import SearchEvent, SearchEventType
+
+
+def emit_event(event: SearchEventType, **data) -> None:
+    """Send a progress event to callers streaming the graph in "custom" mode.
+    Does nothing when called outside a graph run."""
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return
+    writer(SearchEvent(event=event, data=data))
@@ -1,13 +1,136 @@
-from google.cloud import secretmanager
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+import json
+import logging
 import os
+import threading
+import time
 
 load_dotenv()
 
 
+# Every secret the service reads, as (secret_id, version_id)
+KNOWN_SECRETS = [
+    ("azure-openai-endpoint", "1"),
+    ("azure-openai-api-key", "1"),
+    ("azure-openai-endpoint", "2"),
+    ("azure-openai-api-key", "2"),
+    ("tavily-api-key", "1"),
+    ("exa-api-key", "1"),
+]
+
+
+class EnvSecretBackend:
+    """Reads secrets from environment variables.
+
+    `tavily-api-key` version 1 is read from `TAVILY_API_KEY_V1`, falling back
+    to `TAVILY_API_KEY`.
+    """
+
+    def get(self, secret_id: str, version_id: str) -> str | None:
+        name = secret_id.upper().replace("-", "_")
+        return os.getenv(f"{name}_V{version_id}") or os.getenv(name)
+
+
+class FileSecretBackend:
+    """Reads secrets from a JSON file mapping secret ids to values, or to
+    objects mapping version ids to values."""
+
+    def __init__(self, path: str):
+        with open(path) as f:
+            self.secrets = json.load(f)
+
+    def get(self, secret_id: str, version_id: str) -> str | None:
+        value = self.secrets.get(secret_id)
+        if isinstance(value, dict):
+            return value.get(version_id)
+        return value
+
+
+class GoogleSecretManagerBackend:
+    """Reads secrets from Google Secret Manager with one shared client."""
+
+    def __init__(self, project_id: str):
+        self.project_id = project_id
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                from google.cloud import secretmanager
+
+                self._client = secretmanager.SecretManagerServiceClient()
+            return self._client
+
+    def get(self, secret_id: str, version_id: str) -> str | None:
+        name = f"projects/{self.project_id}/secrets/{secret_id}/versions/{version_id}"
+        response = self.client.access_secret_version(request={"name": name})
+        return response.payload.data.decode("UTF-8")
+
+
+class SecretStore:
+    """Looks secrets up in each backend in turn and caches them in memory."""
+
+    def __init__(self, backends: list, ttl_seconds: float):
+        self.backends = backends
+        self.ttl_seconds = ttl_seconds
+        self._cache: dict[tuple[str, str], tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, secret_id: str, version_id: str) -> str:
+        key = (secret_id, version_id)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+
+        for backend in self.backends:
+            value = backend.get(secret_id, version_id)
+            if value is not None:
+                with self._lock:
+                    self._cache[key] = (value, time.monotonic() + self.ttl_seconds)
+                return value
+        raise KeyError(f"Secret {secret_id} version {version_id} not found")
+
+    def prefetch(self, secrets: list[tuple[str, str]]) -> None:
+        """Fetch secrets concurrently so later lookups are served from memory."""
+
+        def fetch(secret):
+            try:
+                self.get(*secret)
+            except Exception as e:
+                logging.warning(f"Could not prefetch secret {secret[0]}: {e}")
+
+        with ThreadPoolExecutor(max_workers=len(secrets) or 1) as executor:
+            list(executor.map(fetch, secrets))
+
+
+def build_secret_store() -> SecretStore:
+    """Google Secret Manager, or with SECRETS_BACKEND set to "local",
+    environment variables then SECRETS_FILE if set.
+
+    Local backends are never consulted in front of Secret Manager, so a stray
+    environment variable can't override a production secret.
+    """
+    if os.getenv("SECRETS_BACKEND", "gcp") == "local":
+        backends = [EnvSecretBackend()]
+        if os.getenv("SECRETS_FILE"):
+            backends.append(FileSecretBackend(os.getenv("SECRETS_FILE")))
+    else:
+        backends = [GoogleSecretManagerBackend(os.getenv("PROJECT_ID"))]
+    return SecretStore(
+        backends, ttl_seconds=float(os.getenv("SECRETS_TTL_SECONDS", 60 * 60))
+    )
+
+
+secret_store = build_secret_store()
+
+
 def get_secret(secret_id: str, version_id: str):
-    client = secretmanager.SecretManagerServiceClient()
-    name = f"projects/{os.getenv('PROJECT_ID')}/secrets/{secret_id}/versions/{version_id}"
+    return secret_store.get(secret_id, version_id)
+
 
-    response = client.access_secret_version(request={"name": name})
-    return response.payload.data.decode("UTF-8")
+def prefetch_secrets(secrets: list[tuple[str, str]] = KNOWN_SECRETS) -> None:
+    secret_store.prefetch(secrets)
@@ -3,56 +3,137 @@ from langgraph.graph import START, END, StateGraph
 from agent.distillers import distill_source
 from agent.validators import (
     validate_source,
+    validate_and_distill_human_source,
+    rank_sources_lexically,
 )
 from agent.source_compiler import (
     separate_sources_by_type,
     format_citations,
     update_profile_with_job_descriptions,
-    trim_text,
+    select_relevant_passages,
 )
-from agent.search import get_search_queries, deduplicate_and_format_sources
+from agent.search import (
+    get_search_queries,
+    deduplicate_and_format_sources,
+    get_search_providers,
+)
+from agent.budget import (
+    RequestBudget,
+    get_budget,
+    release_budget,
+    start_budget,
+    use_budget,
+)
+from agent.concurrency import llm_slot
+from agent.domain_priors import prioritize_sources, record_source_outcome
+from agent.events import emit_event
 from models.search import (
     SearchState,
     SearchInputState,
     OutputState,
     EvaluationInputState,
 )
-from services.tavily import tavily_search_async
+from services.cassette import replay_or_record_async
+from services.metrics import sources_accepted, sources_fanned_out, timed_node
+from services.search_provider import multi_provider_search
 from langserve import RemoteRunnable
+import asyncio
 import os
+import uuid
 
 
 def generate_queries(state: SearchState):
-    content = get_search_queries(
-        state.job.job_description,
-        state.number_of_queries,
-        state.profile,
+    request_id = uuid.uuid4().hex
+    budget = start_budget(
+        request_id,
+        deadline_ms=state.deadline_ms,
+        max_llm_calls=state.max_llm_calls,
+        max_tokens=state.max_tokens,
+    )
+    with use_budget(budget):
+        content = get_search_queries(
+            state.job.job_description,
+            state.number_of_queries,
+            state.profile,
+        )
+
+    emit_event(
+        "queries_generated",
+        queries=[query.model_dump() for query in content.queries],
     )
+    return {"search_queries": content.queries, "request_id": request_id}
+
 
-    return {"search_queries": content.queries}
+def _collapse_and_rank_sources(
+    all_sources: list[dict], profile_entities: list[str], min_score: float
+) -> dict[str, dict]:
+    """Collapse duplicate search results and pre-rank them with BM25."""
+    sources = deduplicate_and_format_sources(all_sources)
+    return rank_sources_lexically(sources, profile_entities, min_score)
 
 
 async def gather_sources(state: SearchState):
-    all_sources = await tavily_search_async(state.search_queries)
-    unvalidated_sources = deduplicate_and_format_sources(all_sources)
+    budget = get_budget(state.request_id)
+    all_sources = await multi_provider_search(
+        state.search_queries,
+        get_search_providers(),
+        on_result=lambda response: emit_event(
+            "search_completed",
+            query=response["query"],
+            provider=response["provider"],
+            urls=[result["url"] for result in response["results"]],
+        ),
+        timeout=budget.remaining_seconds(),
+    )
+    for response in all_sources:
+        if response.get("timed_out"):
+            budget.skip(
+                "search",
+                "deadline",
+                query=response["query"],
+                provider=response["provider"],
+            )
+    # Shingling and tokenizing every page is CPU-bound: keep it off the event loop
+    unvalidated_sources = await asyncio.to_thread(
+        _collapse_and_rank_sources,
+        all_sources,
+        state.profile.get_entities(),
+        state.lexical_score_threshold,
+    )
     return {"unvalidated_sources": unvalidated_sources}
 
 
 def initiate_source_validation(state: SearchState):
-    return [
+    urls, skipped_urls = prioritize_sources(state.unvalidated_sources)
+    budget = get_budget(state.request_id)
+    for url in skipped_urls:
+        budget.skip("validation", "domain_prior", url=url)
+    sends = [
         Send("validate_and_distill_source", state.model_copy(update={"source": source}))
-        for source in state.unvalidated_sources.keys()
+        for source in urls
     ]
+    sources_fanned_out.observe(len(sends))
+    # With nothing to validate, still compile the (empty) sources and skips
+    return sends or "compile_sources"
 
 
-def validate_and_distill_source(state: SearchState):
-    source = state.unvalidated_sources[state.source]
-    if source["raw_content"] is None:
-        return {"validated_sources": []}
-
-    source["raw_content"] = trim_text(source["raw_content"])
+async def _validate_and_distill(
+    state: SearchState, source: dict, budget: RequestBudget
+) -> tuple[float, str | None]:
+    if state.validation_mode == "combined" and not source["is_job_description"]:
+        result = await validate_and_distill_human_source(
+            raw_content=source["raw_content"],
+            title=source["title"],
+            candidate_full_name=state.profile.full_name,
+            candidate_context=state.profile.to_context_string(),
+            confidence_threshold=state.confidence_threshold,
+        )
+        if not result.distilled_source:
+            # Nothing to cite without a summary, whatever the confidence
+            return 0.0, None
+        return result.confidence, result.distilled_source
 
-    confidence = validate_source(
+    confidence = await validate_source(
         raw_content=source["raw_content"],
         title=source["title"],
         candidate_full_name=state.profile.full_name,
@@ -60,22 +141,82 @@ def validate_and_distill_source(state: SearchState):
         role_query=source["query"],
         is_job_description=source["is_job_description"],
     )
-
     if confidence < state.confidence_threshold:
-        return {"validated_sources": []}
-
-    source["weight"] = confidence
-    source["distilled_content"] = distill_source(
+        return confidence, None
+    # Job descriptions are distilled later, per role, in compile_sources
+    if not source["is_job_description"] and (reason := budget.try_reserve_llm_call()):
+        budget.skip("distillation", reason, url=source["url"])
+        return confidence, None
+    distilled_content = await distill_source(
         raw_content=source["raw_content"],
         is_job_description=source["is_job_description"],
         candidate_full_name=state.profile.full_name,
         role_query=source["query"],
     )
+    return confidence, distilled_content
+
+
+async def validate_and_distill_source(state: SearchState):
+    source = state.unvalidated_sources[state.source]
+    if source["raw_content"] is None:
+        return {"validated_sources": []}
+
+    # Tokenizing long pages would hold up the event loop
+    if source["is_job_description"]:
+        role = source["query"].lower().removesuffix("job description")
+        source["raw_content"] = await asyncio.to_thread(
+            select_relevant_passages,
+            source["raw_content"],
+            anchors=[role.strip()],
+            keywords=role.split(),
+        )
+    else:
+        source["raw_content"] = await asyncio.to_thread(
+            select_relevant_passages,
+            source["raw_content"],
+            anchors=[state.profile.full_name],
+            keywords=state.profile.full_name.split() + state.profile.get_entities(),
+        )
+
+    budget = get_budget(state.request_id)
+    try:
+        async with asyncio.timeout(budget.remaining_seconds()):
+            async with llm_slot(state.request_id, state.max_concurrent_validations):
+                with use_budget(budget):
+                    # Checked once a slot is free, since the wait can be long
+                    if reason := budget.try_reserve_llm_call():
+                        budget.skip("validation", reason, url=source["url"])
+                        return {"validated_sources": []}
+                    confidence, distilled_content = await _validate_and_distill(
+                        state, source, budget
+                    )
+    except TimeoutError:
+        budget.skip("validation", "deadline", url=source["url"])
+        return {"validated_sources": []}
+
+    accepted = confidence >= state.confidence_threshold
+    await asyncio.to_thread(record_source_outcome, source, accepted)
+    if distilled_content is None and accepted:
+        # Validated, but the budget ran out before it could be distilled
+        return {"validated_sources": []}
+    emit_event(
+        "source_validated",
+        url=source["url"],
+        title=source["title"],
+        is_job_description=source["is_job_description"],
+        accepted=accepted,
+        confidence=confidence,
+    )
+    if not accepted:
+        return {"validated_sources": []}
 
+    source["weight"] = confidence
+    source["distilled_content"] = distilled_content
     return {"validated_sources": [source]}
 
 
 def compile_sources(state: SearchState):
+    sources_accepted.observe(len(state.validated_sources))
     ranked_sources = sorted(
         state.validated_sources, key=lambda x: x["weight"], reverse=True
     )
@@ -84,42 +225,68 @@ def compile_sources(state: SearchState):
 
     source_str, citations = format_citations(other_sources)
 
-    profile = update_profile_with_job_descriptions(
-        state.profile, job_description_sources
-    )
+    budget = get_budget(state.request_id)
+    with use_budget(budget):
+        profile = update_profile_with_job_descriptions(
+            state.profile, job_description_sources, budget
+        )
+    release_budget(state.request_id)
 
+    emit_event("citations_compiled", citations=citations)
     return {
         "source_str": source_str,
         "citations": citations,
         "profile": profile,
+        "skipped": budget.skipped,
+        "usage": budget.usage_report(),
     }
 
 
+_remote_eval: RemoteRunnable | None = None
+
+
+def get_remote_eval() -> RemoteRunnable:
+    """Evaluation client shared across requests so its connections are reused."""
+    global _remote_eval
+    if _remote_eval is None:
+        _remote_eval = RemoteRunnable(os.getenv("EVAL_ENDPOINT"))
+    return _remote_eval
+
+
 async def get_evaluation(state: SearchState):
-    remote_eval = RemoteRunnable(os.getenv("EVAL_ENDPOINT"))
-    evaluation = await remote_eval.ainvoke(
-        input=EvaluationInputState(
-            source_str=state.source_str,
-            profile=state.profile,
-            job=state.job,
-            citations=state.citations,
-            custom_instructions=state.custom_instructions,
-        )
+    evaluation_input = EvaluationInputState(
+        source_str=state.source_str,
+        profile=state.profile,
+        job=state.job,
+        citations=state.citations,
+        custom_instructions=state.custom_instructions,
+    )
+    evaluation = await replay_or_record_async(
+        "evaluation",
+        # created_at defaults to the time the job was parsed
+        evaluation_input.model_dump(mode="json", exclude={"job": {"created_at"}}),
+        lambda: get_remote_eval().ainvoke(input=evaluation_input),
     )
+    emit_event("evaluation", **evaluation)
     return {**evaluation}
 
 
 builder = StateGraph(SearchState, input=SearchInputState, output=OutputState)
-builder.add_node("generate_queries", generate_queries)
-builder.add_node("gather_sources", gather_sources)
-builder.add_node("validate_and_distill_source", validate_and_distill_source)
-builder.add_node("compile_sources", compile_sources)
-builder.add_node("get_evaluation", get_evaluation)
+for node in (
+    generate_queries,
+    gather_sources,
+    validate_and_distill_source,
+    compile_sources,
+    get_evaluation,
+):
+    builder.add_node(node.__name__, timed_node(node.__name__, node))
 
 builder.add_edge(START, "generate_queries")
 builder.add_edge("generate_queries", "gather_sources")
 builder.add_conditional_edges(
-    "gather_sources", initiate_source_validation, ["validate_and_distill_source"]
+    "gather_sources",
+    initiate_source_validation,
+    ["validate_and_distill_source", "compile_sources"],
 )
 builder.add_edge("validate_and_distill_source", "compile_sources")
 builder.add_edge("compile_sources", "get_evaluation")
@@ -0,0 +1,49 @@
+import json
+import os
+from agent.text_utils import clean_text
+from models.linkedin import AILinkedinJobDescription
+from services.cache import SQLiteTTLCache
+from services.metrics import register_cache
+
+
+job_description_store = (
+    SQLiteTTLCache(
+        path=os.getenv(
+            "JOB_DESCRIPTION_STORE_PATH", ".cache/job_descriptions.sqlite3"
+        ),
+        ttl_seconds=float(
+            os.getenv("JOB_DESCRIPTION_STORE_TTL_SECONDS", 30 * 24 * 60 * 60)
+        ),
+        max_entries=int(os.getenv("JOB_DESCRIPTION_STORE_MAX_ENTRIES", 50000)),
+        table="job_descriptions",
+    )
+    if os.getenv("JOB_DESCRIPTION_STORE_ENABLED", "true").lower() == "true"
+    else None
+)
+register_cache("job_descriptions", job_description_store)
+
+
+def role_key(company: str, title: str) -> str:
+    """Normalize a (company, title) pair so spelling variants share an entry."""
+    return json.dumps(
+        [" ".join(clean_text(company).split()), " ".join(clean_text(title).split())]
+    )
+
+
+def get_job_description(company: str, title: str) -> AILinkedinJobDescription | None:
+    """Return the stored job description for a role if a fresh one exists."""
+    if job_description_store is None or not company or not title:
+        return None
+    stored = job_description_store.get(role_key(company, title))
+    if stored is None:
+        return None
+    return AILinkedinJobDescription(**stored)
+
+
+def save_job_description(
+    company: str, title: str, job_description: AILinkedinJobDescription
+) -> None:
+    """Store a distilled job description for reuse by later candidates."""
+    if job_description_store is None:
+        return
+    job_description_store.set(role_key(company, title), job_description.model_dump())
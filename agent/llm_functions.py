@@ -8,7 +8,9 @@ from agent.prompts import identify_roles_prompt
 @traceable(name="identify_roles")
 def identify_roles(candidate_profile: str) -> RolesOutput:
     """Extract roles from candidate profile."""
-    structured_llm = llm_fast.with_structured_output(RolesOutput)
+    structured_llm = llm_fast.with_structured_output(
+        RolesOutput, cache_site="identify_roles"
+    )
     output = structured_llm.invoke(
         [
             SystemMessage(content=identify_roles_prompt),
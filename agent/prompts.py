@@ -113,6 +113,30 @@ validate_human_source_prompt = """
     Return a confidence score between 0 and 1.
 """
 
+validate_and_distill_human_source_prompt = """
+    Given content from a webpage and candidate information, do two things.
+
+    First, verify:
+    1. Is this content specifically about the candidate?
+    2. Does it match their professional background?
+    3. Is it a profile/article about them rather than just a mention?
+
+    0.0-0.3: Not about the candidate
+    0.4-0.6: Partial match (candidate, but not both)
+    0.7-0.8: Matches both but general description
+    0.9-1.0: Perfect match with candidate details
+
+    Second, if the confidence is {confidence_threshold} or above, extract the relevant information about the candidate from the content.
+    Describe what the source is, what it is about, and how it is relevant to the person, etc.
+    Write it in paragraph form, limited to 150 words.
+    If the confidence is below {confidence_threshold}, return null for the distilled source.
+
+    Candidate Full Name: {candidate_full_name}
+    Candidate Profile:
+    {candidate_context}
+    Raw Content: {raw_content}
+"""
+
 identify_roles_prompt = """
     Extract all professional roles from the given context.
     For each role, identify:
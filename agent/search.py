@@ -1,3 +1,5 @@
+import os
+from functools import lru_cache
 from langchain_core.messages import HumanMessage, SystemMessage
 from langsmith import traceable
 from services.llms import llm
@@ -5,6 +7,23 @@ from models.search import SearchQuery
 from models.base import QueriesOutput
 from models.linkedin import LinkedInProfile
 from agent.prompts import search_query_prompt
+from agent.job_description_store import get_job_description
+from agent.dedup import collapse_duplicate_sources
+from services.search_provider import SearchProvider
+from services.tavily import TavilySearchProvider
+from services.exa import ExaSearchProvider
+
+SEARCH_PROVIDERS = {
+    "tavily": TavilySearchProvider,
+    "exa": ExaSearchProvider,
+}
+
+
+@lru_cache(maxsize=1)
+def get_search_providers() -> list[SearchProvider]:
+    """Providers listed in SEARCH_PROVIDERS (comma separated, default tavily)."""
+    names = os.getenv("SEARCH_PROVIDERS", "tavily").split(",")
+    return [SEARCH_PROVIDERS[name.strip()]() for name in names if name.strip()]
 
 
 def normalize_search_results(search_response) -> list:
@@ -40,12 +59,27 @@ def deduplicate_and_format_sources(search_response) -> dict:
     # Get unified list of results
     sources_list = normalize_search_results(search_response)
 
-    # Deduplicate by URL
-    unique_sources = {source["url"]: source for source in sources_list}
+    # Collapse URL variants and near-duplicate pages, keeping their aliases
+    unique_sources = collapse_duplicate_sources(sources_list)
 
     return unique_sources
 
 
+@lru_cache(maxsize=64)
+def get_job_search_query_prompt(job_description: str, number_of_queries: int) -> str:
+    """Fill the job-specific fields of `search_query_prompt` once per job.
+
+    The candidate fields are left as placeholders so every candidate screened
+    against the same job reuses the formatted prompt.
+    """
+    return search_query_prompt.format(
+        candidate_full_name="{candidate_full_name}",
+        candidate_context="{candidate_context}",
+        job_description=job_description.replace("{", "{{").replace("}", "}}"),
+        number_of_queries=number_of_queries,
+    )
+
+
 @traceable(name="get_search_queries")
 def get_search_queries(
     job_description: str,
@@ -56,6 +90,9 @@ def get_search_queries(
     for experience in profile.experiences[:3]:
         if not experience.company or not experience.title:
             continue
+        # Roles already in the job description store don't need searching
+        if get_job_description(experience.company, experience.title):
+            continue
         role_queries.append(
             SearchQuery(
                 search_query=f"{experience.company} {experience.title} job description",
@@ -64,15 +101,17 @@ def get_search_queries(
         )
 
     # Get general queries from LLM
-    structured_llm = llm.with_structured_output(QueriesOutput)
+    structured_llm = llm.with_structured_output(
+        QueriesOutput, cache_site="get_search_queries"
+    )
     output = structured_llm.invoke(
         [
             SystemMessage(
-                content=search_query_prompt.format(
+                content=get_job_search_query_prompt(
+                    job_description, number_of_queries
+                ).format(
                     candidate_full_name=profile.full_name,
                     candidate_context=profile.to_context_string(),
-                    job_description=job_description,
-                    number_of_queries=number_of_queries,
                 )
             )
         ]
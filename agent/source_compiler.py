@@ -1,5 +1,13 @@
+import logging
+import os
+from functools import lru_cache
 from models.linkedin import LinkedInProfile, AILinkedinJobDescription
+from agent.budget import RequestBudget
 from agent.distillers import distill_job_description
+from agent.job_description_store import get_job_description, save_job_description
+
+SOURCE_TOKEN_BUDGET = int(os.getenv("SOURCE_TOKEN_BUDGET", 6000))
+CHARS_PER_TOKEN = 4
 
 
 def separate_sources_by_type(sources: list[dict]) -> tuple[list[dict], list[dict]]:
@@ -33,6 +41,7 @@ def format_citations(sources: list[dict]) -> tuple[str, list[dict]]:
             {
                 "index": i,
                 "url": source["url"],
+                "aliases": source.get("aliases", []),
                 "confidence": source["weight"],
                 "distilled_content": source["distilled_content"],
             }
@@ -42,13 +51,22 @@ def format_citations(sources: list[dict]) -> tuple[str, list[dict]]:
 
 
 def update_experience_with_job_descriptions(
-    experience, job_description_sources: list[dict], max_sources: int = 3
+    experience,
+    job_description_sources: list[dict],
+    max_sources: int = 3,
+    budget: RequestBudget | None = None,
 ) -> None:
     """Update a single experience entry with relevant job descriptions."""
     # Skip if company or title is None
     if not experience.company or not experience.title:
         return
 
+    # Reuse a fresh job description distilled for an earlier candidate
+    stored_job_description = get_job_description(experience.company, experience.title)
+    if stored_job_description:
+        experience.summarized_job_description = stored_job_description
+        return
+
     # Find matching sources for this experience
     matching_sources = [
         source
@@ -60,6 +78,15 @@ def update_experience_with_job_descriptions(
     ]
 
     if matching_sources:
+        if budget is not None and (reason := budget.try_reserve_llm_call()):
+            budget.skip(
+                "job_description",
+                reason,
+                company=experience.company,
+                title=experience.title,
+            )
+            return
+
         # Get top N sources by confidence
         top_sources = sorted(matching_sources, key=lambda x: x["weight"], reverse=True)[
             :max_sources
@@ -81,14 +108,24 @@ def update_experience_with_job_descriptions(
             requirements=job_description.requirements,
             sources=[source["url"] for source in top_sources],
         )
+        save_job_description(
+            experience.company,
+            experience.title,
+            experience.summarized_job_description,
+        )
 
 
 def update_profile_with_job_descriptions(
-    profile: LinkedInProfile, job_description_sources: list[dict]
+    profile: LinkedInProfile,
+    job_description_sources: list[dict],
+    budget: RequestBudget | None = None,
 ) -> LinkedInProfile:
     """Update all experiences in a profile with job descriptions."""
     for experience in profile.experiences:
-        update_experience_with_job_descriptions(experience, job_description_sources)
+        update_experience_with_job_descriptions(
+            experience, job_description_sources, budget=budget
+        )
+    profile.invalidate_context_string()
     return profile
 
 
@@ -96,7 +133,6 @@ def trim_text(text: str, max_tokens: int = 10000) -> str:
     """Trim text to a maximum estimated tokens by removing content from both ends,
     keeping the middle section.
     """
-    CHARS_PER_TOKEN = 4
     max_chars = max_tokens * CHARS_PER_TOKEN
 
     if len(text) <= max_chars:
@@ -108,3 +144,117 @@ def trim_text(text: str, max_tokens: int = 10000) -> str:
     end = len(text) - trim_each_side
 
     return text[start:end]
+
+
+@lru_cache(maxsize=1)
+def get_tokenizer():
+    """Tokenizer of the gpt-4o family, or None if it can't be loaded."""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logging.warning(f"Falling back to estimated token counts: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    tokenizer = get_tokenizer()
+    if tokenizer is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(tokenizer.encode(text, disallowed_special=()))
+
+
+def split_into_chunks(text: str, chunk_chars: int = 1000) -> list[str]:
+    """Split text into chunks of about `chunk_chars`, breaking at line ends."""
+    chunks = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        while len(line) > chunk_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:chunk_chars])
+            line = line[chunk_chars:]
+        if len(current) + len(line) > chunk_chars and current:
+            chunks.append(current)
+            current = ""
+        current += line
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def select_relevant_passages(
+    text: str,
+    anchors: list[str],
+    keywords: list[str] = (),
+    max_tokens: int = SOURCE_TOKEN_BUDGET,
+    context_chunks: int = 1,
+) -> str:
+    """Keep the passages of `text` around mentions of the anchors and keywords.
+
+    The text is split into chunks. Chunks mentioning an anchor (e.g. the
+    candidate's name) rank above chunks that only mention keywords (e.g.
+    employers or schools); each selected chunk brings `context_chunks`
+    neighbours on either side. Chunks are added best first until `max_tokens`
+    is reached, or the budget left is smaller than every chunk tokenized so
+    far, and returned in document order. Each chunk is tokenized at most once.
+    Falls back to `trim_text` when nothing matches.
+    """
+    # Every token covers at least one character, so short texts always fit
+    if len(text) <= max_tokens:
+        return text
+    if len(text) <= max_tokens * CHARS_PER_TOKEN and count_tokens(text) <= max_tokens:
+        return text
+
+    chunks = split_into_chunks(text)
+    lowered_chunks = [chunk.lower() for chunk in chunks]
+    anchors = [anchor.lower() for anchor in anchors if anchor]
+    keywords = [keyword.lower() for keyword in keywords if keyword]
+
+    scores = [
+        10 * sum(chunk.count(anchor) for anchor in anchors)
+        + sum(chunk.count(keyword) for keyword in keywords)
+        for chunk in lowered_chunks
+    ]
+    ranked = sorted(
+        (i for i, score in enumerate(scores) if score > 0),
+        key=lambda i: scores[i],
+        reverse=True,
+    )
+    if not ranked:
+        return trim_text(text, max_tokens)
+
+    chunk_tokens = {}
+
+    def tokens(j: int) -> int:
+        if j not in chunk_tokens:
+            chunk_tokens[j] = count_tokens(chunks[j])
+        return chunk_tokens[j]
+
+    selected = set()
+    used_tokens = 0
+    for i in ranked:
+        if chunk_tokens and max_tokens - used_tokens < min(chunk_tokens.values()):
+            break
+        window = range(
+            max(0, i - context_chunks), min(len(chunks), i + context_chunks + 1)
+        )
+        # Take the neighbours too if they fit, otherwise just the matching chunk
+        for candidates in (window, [i]):
+            new_chunks = [j for j in candidates if j not in selected]
+            new_tokens = sum(tokens(j) for j in new_chunks)
+            if used_tokens + new_tokens <= max_tokens:
+                selected.update(new_chunks)
+                used_tokens += new_tokens
+                break
+
+    passages = []
+    previous = None
+    for i in sorted(selected):
+        if previous is not None and i != previous + 1:
+            passages.append("\n...\n")
+        passages.append(chunks[i])
+        previous = i
+    return "".join(passages)
@@ -1,9 +1,19 @@
+import math
+from collections import Counter
 from langchain_core.messages import SystemMessage, HumanMessage
 from langsmith import traceable
 from services.llms import llm_fast
-from models.base import ValidationOutput, JobDescriptionValidationOutput
+from models.base import (
+    ValidationOutput,
+    JobDescriptionValidationOutput,
+    ValidateAndDistillOutput,
+)
 from agent.text_utils import clean_text
-from agent.prompts import validate_job_description_prompt, validate_human_source_prompt
+from agent.prompts import (
+    validate_job_description_prompt,
+    validate_human_source_prompt,
+    validate_and_distill_human_source_prompt,
+)
 
 
 @traceable(name="job_description_heuristic_validator")
@@ -28,12 +38,14 @@ def job_description_heuristic_validator(
 
 
 @traceable(name="job_description_llm_validator")
-def job_description_llm_validator(
+async def job_description_llm_validator(
     raw_content: str, role_query: str
 ) -> JobDescriptionValidationOutput:
     """Validate if content contains a relevant job description using LLM."""
-    structured_llm = llm_fast.with_structured_output(JobDescriptionValidationOutput)
-    output = structured_llm.invoke(
+    structured_llm = llm_fast.with_structured_output(
+        JobDescriptionValidationOutput, cache_site="job_description_llm_validator"
+    )
+    output = await structured_llm.ainvoke(
         [
             SystemMessage(
                 content=validate_job_description_prompt.format(
@@ -47,12 +59,14 @@ def job_description_llm_validator(
 
 
 @traceable(name="llm_validator")
-def llm_validator(
+async def llm_validator(
     raw_content, candidate_full_name: str, candidate_context: str
 ) -> ValidationOutput:
     """Validate if content is about the candidate using LLM."""
-    structured_llm = llm_fast.with_structured_output(ValidationOutput)
-    output = structured_llm.invoke(
+    structured_llm = llm_fast.with_structured_output(
+        ValidationOutput, cache_site="llm_validator"
+    )
+    output = await structured_llm.ainvoke(
         [
             SystemMessage(
                 content=validate_human_source_prompt.format(
@@ -69,6 +83,125 @@ def llm_validator(
     return output
 
 
+@traceable(name="llm_validate_and_distill")
+async def llm_validate_and_distill(
+    raw_content,
+    candidate_full_name: str,
+    candidate_context: str,
+    confidence_threshold: float,
+) -> ValidateAndDistillOutput:
+    """Validate if content is about the candidate and distill it in one LLM call.
+    Content is only distilled at or above `confidence_threshold`."""
+    structured_llm = llm_fast.with_structured_output(
+        ValidateAndDistillOutput, cache_site="llm_validate_and_distill"
+    )
+    output = await structured_llm.ainvoke(
+        [
+            SystemMessage(
+                content=validate_and_distill_human_source_prompt.format(
+                    raw_content=raw_content,
+                    candidate_full_name=candidate_full_name,
+                    candidate_context=candidate_context,
+                    confidence_threshold=confidence_threshold,
+                )
+            ),
+            HumanMessage(
+                content="Rate how relevant this content is to the candidate (0-1) "
+                "and extract key professional information"
+            ),
+        ]
+    )
+    return output
+
+
+def bm25_scores(
+    documents: list[list[str]], query_terms: list[str], k1: float = 1.5, b: float = 0.75
+) -> list[float]:
+    """Okapi BM25 score of every tokenized document against the query terms."""
+    if not documents:
+        return []
+
+    avg_length = sum(len(doc) for doc in documents) / len(documents) or 1.0
+    term_frequencies = [Counter(doc) for doc in documents]
+    document_frequency = Counter(
+        term
+        for frequencies in term_frequencies
+        for term in query_terms
+        if term in frequencies
+    )
+    idf = {
+        term: math.log(
+            (len(documents) - document_frequency[term] + 0.5)
+            / (document_frequency[term] + 0.5)
+            + 1
+        )
+        for term in query_terms
+    }
+
+    scores = []
+    for doc, frequencies in zip(documents, term_frequencies):
+        length_norm = k1 * (1 - b + b * len(doc) / avg_length)
+        scores.append(
+            sum(
+                idf[term]
+                * frequencies[term]
+                * (k1 + 1)
+                / (frequencies[term] + length_norm)
+                for term in query_terms
+                if term in frequencies
+            )
+        )
+    return scores
+
+
+@traceable(name="rank_sources_lexically")
+def rank_sources_lexically(
+    sources: dict[str, dict], profile_entities: list[str], min_score: float
+) -> dict[str, dict]:
+    """Score human sources against the profile's entities with BM25.
+
+    Scores are normalized to the best source in the batch and stored as
+    `lexical_score`. Sources below `min_score` are dropped and the rest are
+    ordered best first. The title check is not an exception: a page naming
+    the candidate in its title is the one that would cost an LLM call, so
+    recall is kept by a low `min_score` instead. Job description sources are
+    validated against the role query instead, so they are kept as they are.
+    """
+    query_terms = list(
+        dict.fromkeys(
+            term
+            for entity in profile_entities
+            for term in clean_text(entity).split()
+            if len(term) > 1
+        )
+    )
+    human_urls = [
+        url for url, source in sources.items() if not source["is_job_description"]
+    ]
+    if not query_terms or not human_urls:
+        return sources
+
+    documents = [
+        clean_text(
+            f"{sources[url]['title'] or ''} {sources[url]['raw_content'] or ''}"
+        ).split()
+        for url in human_urls
+    ]
+    scores = bm25_scores(documents, query_terms)
+    best_score = max(scores) or 1.0
+
+    ranked = {
+        url: source for url, source in sources.items() if source["is_job_description"]
+    }
+    for url, score in sorted(zip(human_urls, scores), key=lambda x: x[1], reverse=True):
+        normalized_score = score / best_score
+        if normalized_score < min_score or (min_score > 0 and score == 0):
+            continue
+        sources[url]["lexical_score"] = normalized_score
+        ranked[url] = sources[url]
+    return ranked
+
+
 def heuristic_validator(content, title, candidate_full_name: str) -> float:
     """Basic validation using text matching."""
     if not content or not candidate_full_name:
@@ -84,7 +217,7 @@ def heuristic_validator(content, title, candidate_full_name: str) -> float:
 
 
 @traceable(name="validate_source")
-def validate_source(
+async def validate_source(
     raw_content: str,
     title: str,
     candidate_full_name: str = None,
@@ -107,7 +240,7 @@ def validate_source(
             return 0.0
 
         # Then do detailed LLM validation
-        llm_result = job_description_llm_validator(raw_content, role_query)
+        llm_result = await job_description_llm_validator(raw_content, role_query)
         return llm_result.confidence
 
     else:
@@ -120,5 +253,31 @@ def validate_source(
             return 0.0
 
         # Then do detailed LLM validation
-        llm_result = llm_validator(raw_content, candidate_full_name, candidate_context)
+        llm_result = await llm_validator(
+            raw_content, candidate_full_name, candidate_context
+        )
         return llm_result.confidence
+
+
+@traceable(name="validate_and_distill_human_source")
+async def validate_and_distill_human_source(
+    raw_content: str,
+    title: str,
+    candidate_full_name: str,
+    candidate_context: str,
+    confidence_threshold: float,
+) -> ValidateAndDistillOutput:
+    """Validate and distill a non-job-description source with a single LLM call.
+    The distilled source is None when the confidence is below
+    `confidence_threshold`."""
+    if not candidate_full_name or not candidate_context:
+        return ValidateAndDistillOutput(confidence=0.0)
+
+    # First check heuristic match
+    heuristic_score = heuristic_validator(raw_content, title, candidate_full_name)
+    if heuristic_score < 0.3:
+        return ValidateAndDistillOutput(confidence=0.0)
+
+    return await llm_validate_and_distill(
+        raw_content, candidate_full_name, candidate_context, confidence_threshold
+    )
@@ -0,0 +1,21 @@
+import logging
+import time
+from agent.get_secret import prefetch_secrets
+from agent.search import get_search_providers
+from agent.source_compiler import get_tokenizer
+from services.llms import warm_up_llms
+
+
+def warm_up() -> None:
+    """Fetch secrets and build clients and the tokenizer ahead of the first
+    request. Everything here is otherwise done lazily on first use."""
+    start = time.perf_counter()
+    prefetch_secrets()
+    warm_up_llms()
+    for provider in get_search_providers():
+        try:
+            provider.warm_up()
+        except Exception as e:
+            logging.warning(f"Could not warm up {provider.name}: {e}")
+    get_tokenizer()
+    logging.info(f"Warm-up finished in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,97 @@
+"""Benchmark computing career metrics for large batches of profiles.
+
+Compares the NumPy tenure arithmetic with the same metrics computed one
+profile at a time in Python, checks both agree, and reports the throughput of
+the full metrics (tenures, tech stacks, company tiers and tags). Run from the
+repository root:
+
+    python -m benchmarks.bench_career_metrics
+"""
+
+import time
+from datetime import date
+from agent.career_metrics import (
+    compute_career_metrics,
+    compute_tenure_metrics,
+    to_month,
+)
+from benchmarks.fixtures import make_profile
+
+AS_OF = date(2025, 6, 1)
+
+
+def loop_tenure_metrics(profiles, as_of: date) -> list[tuple[int, int, int]]:
+    """Total, average and current tenure of each profile, one at a time."""
+    as_of_month = to_month(as_of)
+    metrics = []
+    for profile in profiles:
+        intervals = []
+        current = -1
+        for experience in profile.experiences:
+            if experience.starts_at is None:
+                continue
+            start = min(to_month(experience.starts_at), as_of_month)
+            end = (
+                min(to_month(experience.ends_at), as_of_month)
+                if experience.ends_at
+                else as_of_month
+            )
+            end = max(start, end)
+            intervals.append((start, end))
+            if experience.ends_at is None:
+                current = max(current, end - start + 1)
+        if not intervals:
+            metrics.append((-1, -1, current))
+            continue
+
+        total = 0
+        covered_until = -1
+        for start, end in sorted(intervals):
+            total += max(0, end - max(start - 1, covered_until))
+            covered_until = max(covered_until, end)
+        average = round(
+            sum(end - start + 1 for start, end in intervals) / len(intervals)
+        )
+        metrics.append((total, average, current))
+    return metrics
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+def main() -> None:
+    base = [
+        make_profile(n_experiences=8, n_funding_rounds=10, seed=seed)
+        for seed in range(100)
+    ]
+    for n_profiles in (1000, 10000, 50000):
+        profiles = (base * (n_profiles // len(base) + 1))[:n_profiles]
+
+        total, average, current = compute_tenure_metrics(profiles, AS_OF)
+        assert list(zip(total.tolist(), average.tolist(), current.tolist())) == (
+            loop_tenure_metrics(profiles, AS_OF)
+        )
+
+        loop = best_of(lambda: loop_tenure_metrics(profiles, AS_OF))
+        vectorized = best_of(lambda: compute_tenure_metrics(profiles, AS_OF))
+        print(
+            f"{n_profiles:>6} profiles, tenures: loop {loop * 1000:8.1f} ms, "
+            f"numpy {vectorized * 1000:8.1f} ms ({loop / vectorized:4.1f}x)"
+        )
+
+    profiles = base * 20
+    full = best_of(lambda: compute_career_metrics(profiles, AS_OF), repeat=3)
+    print(
+        f"{len(profiles):>6} profiles, full metrics: {full * 1000:8.1f} ms "
+        f"({len(profiles) / full:,.0f} profiles/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
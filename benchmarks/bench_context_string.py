@@ -0,0 +1,45 @@
+"""Benchmark LinkedInProfile.to_context_string as used by one request.
+
+A request renders the candidate context once for query generation and once
+per validated source. Run from the repository root:
+
+    python -m benchmarks.bench_context_string
+"""
+
+import timeit
+from benchmarks.fixtures import make_profile
+
+SOURCES_PER_REQUEST = 50
+
+
+def render_uncached(profile) -> None:
+    for _ in range(SOURCES_PER_REQUEST + 1):
+        profile.invalidate_context_string()
+        profile.to_context_string()
+
+
+def render_cached(profile) -> None:
+    profile.invalidate_context_string()
+    for _ in range(SOURCES_PER_REQUEST + 1):
+        profile.to_context_string()
+
+
+def main(number: int = 20, repeat: int = 5) -> None:
+    for n_experiences in (5, 20, 50):
+        profile = make_profile(n_experiences=n_experiences)
+        uncached = min(
+            timeit.repeat(lambda: render_uncached(profile), number=number, repeat=repeat)
+        )
+        cached = min(
+            timeit.repeat(lambda: render_cached(profile), number=number, repeat=repeat)
+        )
+        print(
+            f"{n_experiences:>3} experiences: "
+            f"uncached {uncached / number * 1000:8.3f} ms/request, "
+            f"cached {cached / number * 1000:8.3f} ms/request "
+            f"({uncached / cached:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
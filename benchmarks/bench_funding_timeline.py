@@ -0,0 +1,123 @@
+"""Benchmark LinkedInCompany funding lookups on long funding histories.
+
+Career metrics look up the funding stage when a candidate joined each company
+and the stages they went through there. Compares the indexed lookups with the
+previous implementation, which filtered and sorted `funding_data` on every
+call. Run from the repository root:
+
+    python -m benchmarks.bench_funding_timeline
+"""
+
+import random
+import timeit
+from datetime import date
+from benchmarks.fixtures import make_company
+from models.career import FundingType
+
+
+def legacy_get_funding_stage_at_date(company, target_date: date) -> FundingType:
+    if not company.funding_data:
+        return FundingType.UNKNOWN
+    current_stage = FundingType.UNKNOWN
+    for funding in sorted(
+        [f for f in company.funding_data if f.announced_date],
+        key=lambda x: x.announced_date,
+    ):
+        if funding.announced_date <= target_date:
+            current_stage = funding.funding_type
+        else:
+            break
+    return current_stage
+
+
+def legacy_get_funding_stages_between_dates(
+    company, start_date: date, end_date: date = None, cutoff_date: date = None
+) -> list[FundingType]:
+    """The previous implementation with its two bugs corrected: the cutoff
+    filter raised TypeError whenever no cutoff_date was given, and the result
+    started with the last stage instead of the stage at `start_date`."""
+    if not company.funding_data:
+        return []
+    end_date = end_date or date.today()
+    valid_funding = [
+        f
+        for f in company.funding_data
+        if f.announced_date and (not cutoff_date or f.announced_date >= cutoff_date)
+    ]
+    if not valid_funding:
+        return [FundingType.UNKNOWN]
+    current_stage = legacy_get_funding_stage_at_date(company, start_date)
+    stages = [current_stage]
+    for funding in sorted(valid_funding, key=lambda x: x.announced_date):
+        if start_date < funding.announced_date <= end_date:
+            stage = funding.funding_type
+            if stage != current_stage:
+                stages.append(stage)
+                current_stage = stage
+    return list(dict.fromkeys(stages))
+
+
+def random_tenures(rng: random.Random, n: int) -> list[tuple[date, date]]:
+    tenures = []
+    for _ in range(n):
+        start = date(rng.randint(1998, 2030), rng.randint(1, 12), 1)
+        tenures.append((start, date(start.year + rng.randint(0, 6), 12, 31)))
+    return tenures
+
+
+def lookups(company, tenures, get_stage, get_stages) -> None:
+    for start, end in tenures:
+        get_stage(company, start)
+        get_stages(company, start, end)
+
+
+def main(number: int = 20, repeat: int = 5) -> None:
+    rng = random.Random(0)
+    tenures = random_tenures(rng, 200)
+    for n_funding_rounds in (5, 20, 50, 200):
+        company = make_company(rng, n_funding_rounds)
+
+        for start, end in tenures:
+            assert company.get_funding_stage_at_date(
+                start
+            ) == legacy_get_funding_stage_at_date(company, start)
+            for cutoff in (None, start):
+                assert company.get_funding_stages_between_dates(
+                    start, end, cutoff
+                ) == legacy_get_funding_stages_between_dates(
+                    company, start, end, cutoff
+                )
+
+        legacy = min(
+            timeit.repeat(
+                lambda: lookups(
+                    company,
+                    tenures,
+                    legacy_get_funding_stage_at_date,
+                    legacy_get_funding_stages_between_dates,
+                ),
+                number=number,
+                repeat=repeat,
+            )
+        )
+        indexed = min(
+            timeit.repeat(
+                lambda: lookups(
+                    company,
+                    tenures,
+                    type(company).get_funding_stage_at_date,
+                    type(company).get_funding_stages_between_dates,
+                ),
+                number=number,
+                repeat=repeat,
+            )
+        )
+        print(
+            f"{n_funding_rounds:>3} rounds, {len(tenures)} tenures: "
+            f"legacy {legacy / number * 1000:8.3f} ms, "
+            f"indexed {indexed / number * 1000:8.3f} ms ({legacy / indexed:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
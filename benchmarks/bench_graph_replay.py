@@ -0,0 +1,65 @@
+"""Benchmark whole-graph throughput offline, replaying recorded external calls.
+
+Record the search, LLM and evaluation calls of one search once, with the live
+services configured:
+
+    CASSETTE_MODE=record python -m benchmarks.bench_graph_replay input.json --requests 1
+
+then replay it as many concurrent searches as needed, without network access:
+
+    python -m benchmarks.bench_graph_replay input.json --requests 200 --concurrency 16
+
+`input.json` is a `/search/invoke` input. Replayed calls take as long as they
+did when recorded unless CASSETTE_LATENCY_MS is set. Domain priors change
+which sources are validated as they learn, so they are disabled here.
+"""
+
+import os
+
+os.environ.setdefault("CASSETTE_MODE", "replay")
+os.environ.setdefault("DOMAIN_PRIORS_ENABLED", "false")
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from agent.graph import graph
+from models.search import SearchInputState
+
+
+async def run(search_input: dict, requests: int, concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> float:
+        async with semaphore:
+            start = time.perf_counter()
+            await graph.ainvoke(SearchInputState.model_validate(search_input))
+            return time.perf_counter() - start
+
+    return await asyncio.gather(*(one() for _ in range(requests)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="JSON file with a search input")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    with open(args.input) as f:
+        search_input = json.load(f)
+
+    start = time.perf_counter()
+    latencies = sorted(asyncio.run(run(search_input, args.requests, args.concurrency)))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{os.environ['CASSETTE_MODE']}: {args.requests} searches, "
+        f"concurrency {args.concurrency}: {args.requests / elapsed:.2f} searches/s, "
+        f"p50 {statistics.median(latencies):.2f}s, "
+        f"p95 {latencies[int(0.95 * (len(latencies) - 1))]:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
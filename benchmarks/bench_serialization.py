@@ -0,0 +1,136 @@
+"""Benchmark LinkedInProfile.dict and LinkedInProfile.from_dict on large profiles.
+
+Compares the schema-driven implementation with the previous one, which
+walked the dumped dictionaries by hand and tried `date.fromisoformat` on every
+string. Run from the repository root:
+
+    python -m benchmarks.bench_serialization
+"""
+
+import copy
+import timeit
+import warnings
+from datetime import date
+from pydantic import BaseModel, ValidationError
+from benchmarks.fixtures import make_profile
+from models.linkedin import LinkedInProfile
+from models.serializable import SerializableModel
+
+
+def legacy_serialize_dict(d: dict) -> dict:
+    for key, value in d.items():
+        if isinstance(value, date):
+            d[key] = value.isoformat()
+        elif isinstance(value, dict):
+            d[key] = legacy_serialize_dict(value)
+        elif isinstance(value, list):
+            d[key] = [
+                (
+                    legacy_dict(item)
+                    if isinstance(item, SerializableModel)
+                    else (
+                        legacy_serialize_dict(item)
+                        if isinstance(item, dict)
+                        else item.isoformat() if isinstance(item, date) else item
+                    )
+                )
+                for item in value
+            ]
+    return d
+
+
+def legacy_dict(model: BaseModel) -> dict:
+    """`dict()` before the schema-driven implementation, including the
+    LinkedInProfile override that dumped experiences and education twice."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        d = legacy_serialize_dict(BaseModel.dict(model))
+    if isinstance(model, LinkedInProfile):
+        d["experiences"] = [legacy_dict(exp) for exp in model.experiences]
+        d["education"] = [legacy_dict(edu) for edu in model.education]
+    return d
+
+
+def _is_iso_date(value: str) -> bool:
+    try:
+        date.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+
+def legacy_deserialize_dict(d: dict) -> dict:
+    for key, value in d.items():
+        if isinstance(value, str):
+            try:
+                d[key] = date.fromisoformat(value)
+            except ValueError:
+                pass
+        elif isinstance(value, dict):
+            d[key] = legacy_deserialize_dict(value)
+        elif isinstance(value, list):
+            d[key] = [
+                (
+                    legacy_deserialize_dict(item)
+                    if isinstance(item, dict)
+                    else (
+                        date.fromisoformat(item)
+                        if isinstance(item, str) and _is_iso_date(item)
+                        else item
+                    )
+                )
+                for item in value
+            ]
+    return d
+
+
+def legacy_from_dict(data: dict) -> LinkedInProfile:
+    return LinkedInProfile(**legacy_deserialize_dict(data))
+
+
+def main(number: int = 20, repeat: int = 5) -> None:
+    for n_experiences, n_funding_rounds in ((5, 5), (20, 15), (50, 30)):
+        profile = make_profile(
+            n_experiences=n_experiences, n_funding_rounds=n_funding_rounds
+        )
+        data = profile.dict()
+        assert data == legacy_dict(profile)
+
+        # The previous from_dict turned founded_on, a str field, into a date
+        try:
+            legacy_from_dict(copy.deepcopy(data))
+        except ValidationError:
+            pass
+        else:
+            raise AssertionError("expected the legacy from_dict to reject founded_on")
+        for experience in data["experiences"]:
+            experience["company_data"]["founded_on"] = None
+
+        dump_legacy = min(
+            timeit.repeat(lambda: legacy_dict(profile), number=number, repeat=repeat)
+        )
+        dump = min(timeit.repeat(lambda: profile.dict(), number=number, repeat=repeat))
+
+        # The previous implementation mutated its input, so each run gets a copy
+        copies = [copy.deepcopy(data) for _ in range(number * repeat)]
+        load_legacy = min(
+            timeit.repeat(
+                lambda: legacy_from_dict(copies.pop()), number=number, repeat=repeat
+            )
+        )
+        load = min(
+            timeit.repeat(
+                lambda: LinkedInProfile.from_dict(data), number=number, repeat=repeat
+            )
+        )
+        print(
+            f"{n_experiences:>3} experiences x {n_funding_rounds:>2} rounds: "
+            f"dict {dump_legacy / number * 1000:7.3f} -> {dump / number * 1000:7.3f} ms "
+            f"({dump_legacy / dump:4.1f}x), "
+            f"from_dict {load_legacy / number * 1000:7.3f} -> "
+            f"{load / number * 1000:7.3f} ms ({load_legacy / load:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
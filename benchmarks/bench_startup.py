@@ -0,0 +1,263 @@
+"""Benchmark service cold start: importing `main` and serving a first search.
+
+Each sample runs in a fresh interpreter so module caches don't carry over.
+The first request is a full `/search/invoke`, so it pays for fetching
+secrets, building the LLM and search clients and loading the tokenizer,
+unless the startup warm-up (see WARM_UP_MODE) got there first. Azure OpenAI,
+Tavily and the evaluation service are served by a local stub that answers
+at once, so the timings are the service's own. The Vertex AI fallback is
+still built, and needs Google credentials as in the service. Run from the
+repository root:
+
+    python -m benchmarks.bench_startup           # compare with the baseline
+    python -m benchmarks.bench_startup --save    # record a new baseline
+
+Like `benchmarks.run`, exits with status 1 when a timing is slower than the
+baseline by more than the tolerance.
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from benchmarks.fixtures import make_page, make_profile
+from benchmarks.run import DEFAULT_TOLERANCE, load_baseline, save_baseline
+from models.jobs import Job
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "startup.json")
+CANDIDATE_NAME = "Jane Doe"
+
+PROBE = """
+import json, os, sys, time
+search_input = json.load(sys.stdin)
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    client.post("/search/invoke", json={"input": search_input}).raise_for_status()
+    first_search = time.perf_counter()
+    print(json.dumps({
+        "import_seconds": imported - start,
+        "first_search_seconds": first_search - start,
+    }), flush=True)
+    # Don't wait for a background warm-up to finish
+    os._exit(0)
+"""
+
+
+def fake_value(schema: dict, definitions: dict):
+    """Smallest value matching a JSON schema, with confident scores so
+    sources are accepted and the whole search runs."""
+    if "$ref" in schema:
+        return fake_value(definitions[schema["$ref"].split("/")[-1]], definitions)
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [option for option in schema[key] if option.get("type") != "null"]
+            return fake_value(options[0], definitions)
+    if "enum" in schema:
+        return schema["enum"][0]
+    kind = schema.get("type", "string")
+    if kind == "object":
+        return {
+            name: fake_value(property_schema, definitions)
+            for name, property_schema in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [fake_value(schema.get("items", {}), definitions)]
+    if kind == "number":
+        return 0.9
+    if kind == "integer":
+        return 1
+    if kind == "boolean":
+        return False
+    return CANDIDATE_NAME
+
+
+def chat_completion(request: dict) -> dict:
+    """Azure OpenAI chat completion calling the requested structured output tool."""
+    message = {"role": "assistant", "content": "Done."}
+    if request.get("tools"):
+        function = request["tools"][0]["function"]
+        parameters = function["parameters"]
+        arguments = fake_value(parameters, parameters.get("$defs", {}))
+        message = {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": "call_0",
+                    "type": "function",
+                    "function": {
+                        "name": function["name"],
+                        "arguments": json.dumps(arguments),
+                    },
+                }
+            ],
+        }
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": 0,
+        "model": request.get("model") or "stub",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": message}],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+
+
+def tavily_search(request: dict) -> dict:
+    rng = random.Random(request["query"])
+    return {
+        "query": request["query"],
+        "results": [
+            {
+                "url": f"https://example.com/{i}/{rng.randrange(10**9)}",
+                "title": f"{CANDIDATE_NAME} - {request['query']}",
+                "content": f"{CANDIDATE_NAME} at Stripe",
+                "raw_content": f"{CANDIDATE_NAME} at Stripe. {make_page(rng, 500)}",
+                "score": 0.9,
+            }
+            for i in range(3)
+        ],
+        "response_time": 0.0,
+    }
+
+
+EVALUATION = {
+    "sections": [],
+    "summary": "Stub evaluation.",
+    "required_met": 0,
+    "optional_met": 0,
+    "fit": 1,
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers the Azure OpenAI, Tavily and evaluation requests of a search."""
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        path = urlsplit(self.path).path
+        if path.endswith("/chat/completions"):
+            response = chat_completion(request)
+        elif path == "/search":
+            response = tavily_search(request)
+        elif path == "/evaluate/invoke":
+            response = {"output": EVALUATION}
+        else:
+            self.send_error(404)
+            return
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def stub_environment(url: str) -> dict[str, str]:
+    """Service settings that send every external call to the stub, with the
+    caches that would let a search skip those calls disabled."""
+    return {
+        "SECRETS_BACKEND": "local",
+        "AZURE_OPENAI_ENDPOINT_V1": url,
+        "AZURE_OPENAI_ENDPOINT_V2": url,
+        "AZURE_OPENAI_API_KEY_V1": "stub",
+        "AZURE_OPENAI_API_KEY_V2": "stub",
+        "TAVILY_API_KEY_V1": "stub",
+        "TAVILY_API_BASE_URL": url,
+        "EVAL_ENDPOINT": f"{url}/evaluate",
+        "SEARCH_PROVIDERS": "tavily",
+        "TAVILY_CACHE_ENABLED": "false",
+        "LLM_CACHE_BACKEND": "",
+        "JOB_DESCRIPTION_STORE_ENABLED": "false",
+        "DOMAIN_PRIORS_ENABLED": "false",
+        "CASSETTE_MODE": "off",
+    }
+
+
+def search_input() -> dict:
+    job = Job(
+        job_description="Staff engineer for payments infrastructure.",
+        key_traits=[],
+        job_title="Staff Engineer",
+        company_name="Stripe",
+        calibrated_profiles=[],
+    )
+    return {
+        "profile": make_profile(n_experiences=5).model_dump(mode="json"),
+        "job": job.model_dump(mode="json"),
+        "number_of_queries": 3,
+        "confidence_threshold": 0.8,
+    }
+
+
+def measure(environment: dict[str, str], probe_input: str) -> dict:
+    process = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        input=probe_input,
+        env=environment,
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"Startup probe failed:\n{process.stderr[-2000:]}")
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="Record a new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    environment = {
+        **os.environ,
+        **stub_environment(f"http://127.0.0.1:{server.server_port}"),
+    }
+    probe_input = json.dumps(search_input())
+    try:
+        samples = [measure(environment, probe_input) for _ in range(args.repeat)]
+    finally:
+        server.shutdown()
+
+    baseline = load_baseline(args.baseline)
+    results = {}
+    regressions = []
+    for key in ("import_seconds", "first_search_seconds"):
+        values = [sample[key] for sample in samples]
+        results[key] = min(values)
+        line = f"{key}: min {min(values):.2f}s, max {max(values):.2f}s"
+        if key in baseline:
+            ratio = results[key] / baseline[key]
+            line += f"  baseline {baseline[key]:.2f}s  {ratio:5.2f}x"
+            if ratio > 1 + args.tolerance:
+                regressions.append(key)
+                line += "  REGRESSION"
+        print(line)
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if regressions:
+        print(f"Slower than the baseline by more than {args.tolerance:.0%}: ", end="")
+        print(", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Benchmark tech stack detection over the experience descriptions of a profile.
+
+Compares the previous implementation, one substring scan per keyword, with
+the single-pass matcher used per description and in batch. Run from the
+repository root:
+
+    python -m benchmarks.bench_tech_stacks
+"""
+
+import timeit
+from benchmarks.fixtures import make_profile
+from models.career import TechStack, TechStackPatterns
+
+
+def legacy_detect_tech_stacks(text: str) -> set[TechStack]:
+    """`TechStackPatterns.detect_tech_stacks` before the single-pass matcher."""
+    cls = TechStackPatterns
+    text = text.lower()
+    stacks = set()
+    if any(keyword in text for keyword in cls.BACKEND):
+        stacks.add(TechStack.BACKEND)
+    if any(keyword in text for keyword in cls.FRONTEND):
+        stacks.add(TechStack.FRONTEND)
+    if any(keyword in text for keyword in cls.ML_AI):
+        stacks.add(TechStack.ML_AI)
+    if any(keyword in text for keyword in cls.INFRASTRUCTURE):
+        stacks.add(TechStack.INFRASTRUCTURE)
+    if any(keyword in text for keyword in cls.DATA):
+        stacks.add(TechStack.DATA)
+    if TechStack.BACKEND in stacks and TechStack.FRONTEND in stacks:
+        stacks.add(TechStack.FULLSTACK)
+    elif "full stack" in text or "fullstack" in text:
+        stacks.add(TechStack.FULLSTACK)
+        stacks.add(TechStack.BACKEND)
+        stacks.add(TechStack.FRONTEND)
+    return stacks
+
+
+# Phrases the substring scan misreads, e.g. "ai" in "maintained"
+FALSE_POSITIVES = [
+    "Maintained the domain registry and email campaigns for sales.",
+    "Raised capital from angel investors.",
+    "Approved every contract unless legal objected.",
+]
+# A long page without any keyword, where every substring scan runs to the end
+NON_TECHNICAL = (
+    "Managed the regional office, handled payroll and worked with vendors on "
+    "procurement and facilities. "
+) * 40
+
+
+def main(number: int = 200, repeat: int = 5) -> None:
+    cases = [
+        (
+            f"{n_experiences:>3} descriptions",
+            [
+                experience.description
+                for experience in make_profile(n_experiences=n_experiences).experiences
+            ],
+        )
+        for n_experiences in (5, 20, 50)
+    ]
+    cases.append(("non-technical page", [NON_TECHNICAL]))
+    for name, texts in cases:
+        legacy = min(
+            timeit.repeat(
+                lambda: [legacy_detect_tech_stacks(text) for text in texts],
+                number=number,
+                repeat=repeat,
+            )
+        )
+        single = min(
+            timeit.repeat(
+                lambda: [TechStackPatterns.detect_tech_stacks(t) for t in texts],
+                number=number,
+                repeat=repeat,
+            )
+        )
+        batch = min(
+            timeit.repeat(
+                lambda: TechStackPatterns.detect_tech_stacks_batch(texts),
+                number=number,
+                repeat=repeat,
+            )
+        )
+        print(
+            f"{name}: "
+            f"legacy {legacy / number * 1000:7.3f} ms, "
+            f"per text {single / number * 1000:7.3f} ms ({legacy / single:4.1f}x), "
+            f"batch {batch / number * 1000:7.3f} ms ({legacy / batch:4.1f}x)"
+        )
+
+    for text in FALSE_POSITIVES:
+        legacy = sorted(stack.value for stack in legacy_detect_tech_stacks(text))
+        current = sorted(
+            stack.value for stack in TechStackPatterns.detect_tech_stacks(text)
+        )
+        print(f"{text!r}: legacy {legacy}, now {current}")
+
+
+if __name__ == "__main__":
+    main()
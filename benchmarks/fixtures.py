@@ -0,0 +1,173 @@
+"""Synthetic but realistically sized fixtures for the offline benchmarks."""
+
+import random
+from datetime import date
+from models.career import FundingType
+from models.linkedin import (
+    AILinkedinJobDescription,
+    Funding,
+    LinkedInCompany,
+    LinkedInEducation,
+    LinkedInExperience,
+    LinkedInProfile,
+)
+
+COMPANIES = [
+    "Stripe", "Acme Robotics", "Globex", "Initech", "Hooli", "Umbrella Labs",
+    "Vandelay Industries", "Pied Piper", "Soylent", "Wayne Enterprises",
+]
+TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Staff Engineer",
+    "Machine Learning Engineer", "Data Engineer", "Engineering Manager",
+    "Frontend Engineer", "Backend Engineer", "Site Reliability Engineer",
+]
+DESCRIPTIONS = [
+    "Built backend microservices in Python and Go on Kubernetes, with Kafka "
+    "pipelines feeding a PostgreSQL data warehouse.",
+    "Led the React and TypeScript rewrite of the customer dashboard and "
+    "introduced a design system used across three product teams.",
+    "Trained and deployed PyTorch models for ranking; owned the feature store "
+    "and the Airflow jobs that refresh it daily.",
+    "Ran the AWS infrastructure with Terraform, set up Prometheus and Grafana "
+    "monitoring and cut on-call pages by half.",
+]
+STAGES = [
+    FundingType.PRE_SEED, FundingType.SEED, FundingType.SERIES_A,
+    FundingType.SERIES_B, FundingType.SERIES_C, FundingType.SERIES_D,
+    FundingType.SERIES_E, FundingType.SERIES_F, FundingType.PRIVATE_EQUITY,
+]
+
+
+def make_company(rng: random.Random, n_funding_rounds: int = 15) -> LinkedInCompany:
+    name = rng.choice(COMPANIES)
+    funding_data = []
+    year = 2000
+    for i in range(n_funding_rounds):
+        year += rng.randint(0, 2)
+        funding_data.append(
+            Funding(
+                funding_type=STAGES[min(i, len(STAGES) - 1)],
+                money_raised=rng.randint(1, 500) * 1_000_000,
+                announced_date=date(year, rng.randint(1, 12), rng.randint(1, 28)),
+                number_of_investors=rng.randint(1, 10),
+                investor_list=[f"Investor {rng.randint(1, 99)}" for _ in range(3)],
+            )
+        )
+    rng.shuffle(funding_data)
+    return LinkedInCompany(
+        company_id=str(rng.randint(1, 10**6)),
+        name=name,
+        website=f"https://{name.lower().replace(' ', '')}.com",
+        location={"city": "San Francisco", "state": "CA", "country": "US"},
+        description=f"{name} builds software for businesses of every size. " * 5,
+        industries=["Software", "Financial Services"],
+        funding_data=funding_data,
+        founded_on="2000-01-01",
+        ipo_status="Private",
+        operating_status="Active",
+    )
+
+
+def make_profile(
+    n_experiences: int = 20, n_funding_rounds: int = 15, seed: int = 0
+) -> LinkedInProfile:
+    rng = random.Random(seed)
+    experiences = []
+    year = 2024
+    for _ in range(n_experiences):
+        start_year = year - rng.randint(1, 3)
+        experiences.append(
+            LinkedInExperience(
+                title=rng.choice(TITLES),
+                company=rng.choice(COMPANIES),
+                description=rng.choice(DESCRIPTIONS),
+                starts_at=date(start_year, rng.randint(1, 12), 1),
+                ends_at=None if not experiences else date(year, rng.randint(1, 12), 1),
+                location="San Francisco, CA",
+                company_linkedin_profile_url="https://www.linkedin.com/company/acme",
+                company_data=make_company(rng, n_funding_rounds),
+                summarized_job_description=AILinkedinJobDescription(
+                    role_summary="Owns services end to end.",
+                    skills=["python", "kubernetes", "sql"],
+                    requirements=["5+ years of experience"],
+                    sources=["https://jobs.example.com/1"],
+                ),
+            )
+        )
+        year = start_year
+    return LinkedInProfile(
+        full_name="Jane Doe",
+        occupation="Staff Engineer at Stripe",
+        headline="Building payments infrastructure",
+        summary="Engineer with a decade of experience in distributed systems. " * 5,
+        city="San Francisco",
+        country="United States",
+        public_identifier="jane-doe",
+        experiences=experiences,
+        education=[
+            LinkedInEducation(
+                school="Stanford University",
+                degree_name="BS",
+                field_of_study="Computer Science",
+                starts_at=date(2006, 9, 1),
+                ends_at=date(2010, 6, 1),
+            )
+        ],
+    )
+
+
+def make_page(rng: random.Random, n_words: int = 2000) -> str:
+    """Page text built from the description sentences, long like a fetched page."""
+    words = []
+    while len(words) < n_words:
+        words.extend(rng.choice(DESCRIPTIONS).split())
+    return " ".join(words[:n_words])
+
+
+def make_search_responses(
+    n_queries: int = 5, results_per_query: int = 10, seed: int = 0
+) -> list[dict]:
+    """Search responses as returned by the providers, one per query.
+
+    Every third result repeats an earlier URL with tracking parameters, as
+    results of different queries often do.
+    """
+    rng = random.Random(seed)
+    responses = []
+    urls = []
+    for i in range(n_queries):
+        query = "Jane Doe Stripe" if i else "Jane Doe Stripe job description"
+        results = []
+        for j in range(results_per_query):
+            if urls and j % 3 == 2:
+                url = f"{rng.choice(urls)}?utm_source=search"
+            else:
+                url = f"https://www.example{i}.com/jane-doe/{j}"
+                urls.append(url)
+            results.append(
+                {
+                    "title": f"Jane Doe at Stripe ({i}.{j})",
+                    "url": url,
+                    "content": rng.choice(DESCRIPTIONS),
+                    "raw_content": make_page(rng),
+                    "score": rng.random(),
+                }
+            )
+        responses.append({"query": query, "results": results})
+    return responses
+
+
+def make_validated_sources(n_sources: int = 20, seed: int = 0) -> list[dict]:
+    """Sources as they reach the source compiler, after validation."""
+    rng = random.Random(seed)
+    return [
+        {
+            "title": f"Jane Doe at Stripe ({i})",
+            "url": f"https://example.com/jane-doe/{i}",
+            "aliases": [f"https://m.example.com/jane-doe/{i}"],
+            "distilled_content": " ".join(rng.choice(DESCRIPTIONS) for _ in range(3)),
+            "weight": round(rng.random(), 2),
+            "is_job_description": False,
+        }
+        for i in range(n_sources)
+    ]
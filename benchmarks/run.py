@@ -0,0 +1,225 @@
+"""Run the offline benchmark suite and compare it with a JSON baseline.
+
+Times the per-request and per-source hot paths on synthetic fixtures, with no
+network access, and reports each case's time per call against the baseline.
+Exits with status 1 if any case got slower than the baseline by more than the
+tolerance. Run from the repository root:
+
+    python -m benchmarks.run                  # compare with the baseline
+    python -m benchmarks.run --save           # record a new baseline
+    python -m benchmarks.run funding dedup    # only cases matching a name
+
+Timings depend on the machine, so compare against a baseline recorded on the
+same machine (or CI runner type) as the run.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+from datetime import date
+from typing import Callable
+from agent.career_metrics import compute_career_metrics
+from agent.search import deduplicate_and_format_sources, normalize_search_results
+from agent.source_compiler import (
+    format_citations,
+    select_relevant_passages,
+    trim_text,
+)
+from benchmarks.fixtures import (
+    make_page,
+    make_profile,
+    make_search_responses,
+    make_validated_sources,
+)
+from models.career import TechStackPatterns
+from models.linkedin import LinkedInProfile
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "default.json")
+DEFAULT_TOLERANCE = 0.25
+MIN_SECONDS_PER_REPEAT = 0.2
+
+
+def bench_context_string() -> Callable[[], None]:
+    profile = make_profile(n_experiences=20, n_funding_rounds=15)
+
+    def run():
+        profile.invalidate_context_string()
+        profile.to_context_string()
+
+    return run
+
+
+def bench_context_string_cached() -> Callable[[], None]:
+    profile = make_profile(n_experiences=20, n_funding_rounds=15)
+    return profile.to_context_string
+
+
+def bench_profile_dict() -> Callable[[], None]:
+    return make_profile(n_experiences=20, n_funding_rounds=15).dict
+
+
+def bench_profile_from_dict() -> Callable[[], None]:
+    data = make_profile(n_experiences=20, n_funding_rounds=15).dict()
+    return lambda: LinkedInProfile.from_dict(data)
+
+
+def bench_normalize_search_results() -> Callable[[], None]:
+    responses = make_search_responses()
+    return lambda: normalize_search_results(responses)
+
+
+def bench_deduplicate_sources() -> Callable[[], None]:
+    responses = make_search_responses()
+    return lambda: deduplicate_and_format_sources(responses)
+
+
+def bench_detect_tech_stacks() -> Callable[[], None]:
+    text = make_page(random.Random(0), n_words=2000)
+    return lambda: TechStackPatterns.detect_tech_stacks(text)
+
+
+def bench_trim_text() -> Callable[[], None]:
+    text = make_page(random.Random(0), n_words=20000)
+    return lambda: trim_text(text, max_tokens=2000)
+
+
+def bench_select_relevant_passages() -> Callable[[], None]:
+    rng = random.Random(0)
+    # A long page mentioning the candidate throughout
+    text = " ".join(f"{make_page(rng, n_words=200)} Jane Doe." for _ in range(100))
+    return lambda: select_relevant_passages(
+        text, anchors=["Jane Doe"], keywords=["Stripe", "Stanford"], max_tokens=2000
+    )
+
+
+def bench_format_citations() -> Callable[[], None]:
+    sources = make_validated_sources(n_sources=20)
+    return lambda: format_citations(sources)
+
+
+def bench_funding_stage_at_date() -> Callable[[], None]:
+    profile = make_profile(n_experiences=20, n_funding_rounds=15)
+
+    def run():
+        for experience in profile.experiences:
+            experience.company_data.get_funding_stage_at_date(experience.starts_at)
+
+    return run
+
+
+def bench_funding_stages_between_dates() -> Callable[[], None]:
+    profile = make_profile(n_experiences=20, n_funding_rounds=15)
+
+    def run():
+        for experience in profile.experiences:
+            experience.company_data.get_funding_stages_between_dates(
+                experience.starts_at, experience.ends_at
+            )
+
+    return run
+
+
+def bench_career_metrics() -> Callable[[], None]:
+    profiles = [
+        make_profile(n_experiences=20, n_funding_rounds=15, seed=seed)
+        for seed in range(10)
+    ] * 10
+    return lambda: compute_career_metrics(profiles, as_of=date(2025, 6, 1))
+
+
+CASES: dict[str, Callable[[], Callable[[], None]]] = {
+    "context_string": bench_context_string,
+    "context_string_cached": bench_context_string_cached,
+    "profile_dict": bench_profile_dict,
+    "profile_from_dict": bench_profile_from_dict,
+    "normalize_search_results": bench_normalize_search_results,
+    "deduplicate_sources": bench_deduplicate_sources,
+    "detect_tech_stacks": bench_detect_tech_stacks,
+    "trim_text": bench_trim_text,
+    "select_relevant_passages": bench_select_relevant_passages,
+    "format_citations": bench_format_citations,
+    "funding_stage_at_date": bench_funding_stage_at_date,
+    "funding_stages_between_dates": bench_funding_stages_between_dates,
+    "career_metrics_100_profiles": bench_career_metrics,
+}
+
+
+def measure(run: Callable[[], None], repeat: int) -> float:
+    """Best seconds per call over `repeat` runs of at least
+    MIN_SECONDS_PER_REPEAT each."""
+    timer = timeit.Timer(run)
+    number, elapsed = timer.autorange()
+    number = max(number, int(number * MIN_SECONDS_PER_REPEAT / elapsed))
+    return min(timer.repeat(number=number, repeat=repeat)) / number
+
+
+def load_baseline(path: str) -> dict[str, float]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)["seconds_per_call"]
+
+
+def save_baseline(path: str, results: dict[str, float]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    baseline = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seconds_per_call": results,
+    }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cases", nargs="*", help="Only run cases containing these")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="Record a new baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed slowdown as a fraction of the baseline",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    names = [
+        name
+        for name in CASES
+        if not args.cases or any(pattern in name for pattern in args.cases)
+    ]
+    baseline = load_baseline(args.baseline)
+    results = {}
+    regressions = []
+    for name in names:
+        results[name] = measure(CASES[name](), args.repeat)
+        line = f"{name:<30} {results[name] * 1e6:12.1f} us"
+        if name in baseline:
+            ratio = results[name] / baseline[name]
+            line += f"  baseline {baseline[name] * 1e6:12.1f} us  {ratio:5.2f}x"
+            if ratio > 1 + args.tolerance:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+
+    if args.save:
+        # Keep the baseline of cases that weren't run this time
+        save_baseline(args.baseline, {**baseline, **results})
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if regressions:
+        print(f"Slower than the baseline by more than {args.tolerance:.0%}: ", end="")
+        print(", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
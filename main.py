@@ -1,17 +1,88 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from langserve import add_routes
+from sse_starlette.sse import EventSourceResponse
 from agent.graph import graph
+from agent.warmup import warm_up
+from agent.batch import search_batch
+from agent.career_metrics import compute_career_metrics
+from models.career import CareerMetrics
+from models.linkedin import LinkedInProfile
+from models.search import BatchSearchInputState, SearchInputState
+from services.metrics import metrics_app
 from dotenv import load_dotenv
+import asyncio
+import json
 import os
 
 
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # "background" serves traffic immediately while clients are built,
+    # "blocking" finishes warming up before the first request, "off" is lazy
+    warm_up_mode = os.getenv("WARM_UP_MODE", "background")
+    warm_up_task = None
+    if warm_up_mode == "blocking":
+        await asyncio.to_thread(warm_up)
+    elif warm_up_mode == "background":
+        warm_up_task = asyncio.create_task(asyncio.to_thread(warm_up))
+    yield
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+
+
 app = FastAPI(
   title="Candidate search",
   version="1.0",
   description="",
+  lifespan=lifespan,
 )
+app.mount("/metrics", metrics_app())
+
+
+# langserve already serves /search/batch as N independent invocations, so the
+# shared-job batch lives next to it.
+@app.post("/search/job_batch")
+async def search_job_batch(batch: BatchSearchInputState):
+    """Screen many candidates against one job, streaming one event per candidate."""
+
+    async def event_stream():
+        async for result in search_batch(batch):
+            yield {
+                "event": "error" if "error" in result else "result",
+                "data": json.dumps(result, default=str),
+            }
+        yield {"event": "end", "data": ""}
+
+    return EventSourceResponse(event_stream())
+
+
+@app.post("/career_metrics")
+async def career_metrics(profiles: list[LinkedInProfile]) -> list[CareerMetrics]:
+    """Compute the career metrics of many profiles in one vectorized pass."""
+    return await asyncio.to_thread(compute_career_metrics, profiles)
+
+
+@app.post("/search/events")
+async def search_events(search_input: SearchInputState):
+    """Run one search, streaming typed progress events as server-sent events."""
+
+    async def event_stream():
+        try:
+            async for event in graph.astream(search_input, stream_mode="custom"):
+                yield {
+                    "event": event.event,
+                    "data": json.dumps(event.data, default=str),
+                }
+        except Exception as e:
+            yield {"event": "error", "data": json.dumps({"error": str(e)})}
+        yield {"event": "end", "data": ""}
+
+    return EventSourceResponse(event_stream())
+
 
 add_routes(
     app,
@@ -27,6 +27,14 @@ class DistillSourceOutput(BaseModel):
     distilled_source: str
 
 
+class ValidateAndDistillOutput(BaseModel):
+    confidence: float
+    distilled_source: Optional[str] = Field(
+        None,
+        description="Summary of the source, or null if it is not about the candidate.",
+    )
+
+
 class JobDescriptionDistillOutput(BaseModel):
     skills: list[str]
     requirements: list[str]
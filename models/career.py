@@ -1,5 +1,8 @@
+import re
+import string
 from datetime import date
 from enum import Enum
+from functools import lru_cache
 from .serializable import SerializableModel
 
 
@@ -206,37 +209,120 @@ class TechStackPatterns:
         "data architecture",
     }
 
+    FULLSTACK = {
+        "full stack",
+        "fullstack",
+    }
+
+    @classmethod
+    @lru_cache(maxsize=1)
+    def _matcher(cls) -> "KeywordMatcher":
+        keyword_stacks: dict[str, set[TechStack]] = {}
+        for stack, keywords in (
+            (TechStack.BACKEND, cls.BACKEND),
+            (TechStack.FRONTEND, cls.FRONTEND),
+            (TechStack.ML_AI, cls.ML_AI),
+            (TechStack.INFRASTRUCTURE, cls.INFRASTRUCTURE),
+            (TechStack.DATA, cls.DATA),
+            (TechStack.FULLSTACK, cls.FULLSTACK),
+        ):
+            for keyword in keywords:
+                keyword_stacks.setdefault(keyword, set()).add(stack)
+        return KeywordMatcher(keyword_stacks)
+
     @classmethod
     def detect_tech_stacks(cls, text: str) -> set[TechStack]:
         """Detect tech stacks from text description."""
-        text = text.lower()
-        stacks = set()
-
-        # Check for each tech stack
-        if any(keyword in text for keyword in cls.BACKEND):
-            stacks.add(TechStack.BACKEND)
-
-        if any(keyword in text for keyword in cls.FRONTEND):
-            stacks.add(TechStack.FRONTEND)
+        return cls.detect_tech_stacks_batch([text])[0]
 
-        if any(keyword in text for keyword in cls.ML_AI):
-            stacks.add(TechStack.ML_AI)
-
-        if any(keyword in text for keyword in cls.INFRASTRUCTURE):
-            stacks.add(TechStack.INFRASTRUCTURE)
-
-        if any(keyword in text for keyword in cls.DATA):
-            stacks.add(TechStack.DATA)
+    @classmethod
+    def detect_tech_stacks_batch(cls, texts: list[str]) -> list[set[TechStack]]:
+        """Detect the tech stacks of each text, e.g. every experience of a
+        profile, with the keyword tables built once."""
+        matcher = cls._matcher()
+        stacks = []
+        for text in texts:
+            text_stacks = matcher.match(text)
+            # Infer Full Stack
+            if TechStack.FULLSTACK in text_stacks:
+                text_stacks.update((TechStack.BACKEND, TechStack.FRONTEND))
+            elif TechStack.BACKEND in text_stacks and TechStack.FRONTEND in text_stacks:
+                text_stacks.add(TechStack.FULLSTACK)
+            stacks.append(text_stacks)
+        return stacks
 
-        # Infer Full Stack
-        if TechStack.BACKEND in stacks and TechStack.FRONTEND in stacks:
-            stacks.add(TechStack.FULLSTACK)
-        elif "full stack" in text or "fullstack" in text:
-            stacks.add(TechStack.FULLSTACK)
-            stacks.add(TechStack.BACKEND)
-            stacks.add(TechStack.FRONTEND)
 
-        return stacks
+_PUNCTUATION_TO_SPACE = str.maketrans({char: " " for char in string.punctuation})
+
+
+class KeywordMatcher:
+    """Finds whole-word keywords in text in one pass over its words.
+
+    The text is lowercased and split into words at whitespace and punctuation,
+    so "ai" matches in "AI/ML" but not in "domain". Single-word keywords are
+    looked up in a set. Multi-word keywords ("machine learning", "back-end")
+    are only checked when their first word occurs, against the text with its
+    words joined by single spaces. Keywords that start or end with punctuation
+    ("c#", ".net") can't be split into words and are matched with a regex
+    that keeps letters and digits from touching their word edges. A keyword
+    ending in a letter or digit also matches with a trailing "s" or "es", so
+    "api" matches in "APIs".
+    """
+
+    def __init__(self, keyword_values: dict[str, set]):
+        self.words: dict[str, set] = {}
+        self.phrases: dict[str, dict[str, set]] = {}
+        self.symbols: list[tuple[str, re.Pattern, set]] = []
+        for keyword, values in keyword_values.items():
+            keyword = keyword.lower()
+            if not (keyword[0].isalnum() and keyword[-1].isalnum()):
+                pattern = re.escape(keyword)
+                if keyword[0].isalnum():
+                    pattern = rf"(?<![^\W_]){pattern}"
+                if keyword[-1].isalnum():
+                    pattern = rf"{pattern}(?:e?s)?(?![^\W_])"
+                self.symbols.append((keyword, re.compile(pattern), values))
+                continue
+
+            words = keyword.translate(_PUNCTUATION_TO_SPACE).split()
+            if len(words) == 1:
+                for word in (words[0], f"{words[0]}s", f"{words[0]}es"):
+                    self.words.setdefault(word, set()).update(values)
+            else:
+                self.phrases.setdefault(words[0], {}).setdefault(
+                    " ".join(words), set()
+                ).update(values)
+        self._phrase_patterns = {
+            phrase: re.compile(rf" {re.escape(phrase)}(?:e?s)? ")
+            for phrases in self.phrases.values()
+            for phrase in phrases
+        }
+
+    def match(self, text: str) -> set:
+        """Union of the values of every keyword found in `text`."""
+        text = text.lower()
+        words = text.translate(_PUNCTUATION_TO_SPACE).split()
+        word_set = set(words)
+
+        found = set()
+        for word in self.words.keys() & word_set:
+            found.update(self.words[word])
+
+        phrase_starts = self.phrases.keys() & word_set
+        if phrase_starts:
+            joined = f" {' '.join(words)} "
+            for word in phrase_starts:
+                for phrase, values in self.phrases[word].items():
+                    if f" {phrase}" in joined and self._phrase_patterns[
+                        phrase
+                    ].search(joined):
+                        found.update(values)
+
+        for keyword, pattern, values in self.symbols:
+            if keyword in text and pattern.search(text):
+                found.update(values)
+
+        return found
 
 
 class CareerMetrics(SerializableModel):
@@ -2,7 +2,9 @@
 LinkedIn data models with standardized serialization.
 """
 
+from bisect import bisect_left, bisect_right
 from datetime import date
+from pydantic import PrivateAttr
 from .serializable import SerializableModel
 from .career import CareerMetrics, FundingType
 
@@ -33,6 +35,8 @@ class LinkedInCompany(SerializableModel):
     ipo_status: str | None = None
     operating_status: str | None = None
 
+    _funding_index: tuple | None = PrivateAttr(default=None)
+
     @property
     def funding_stage(self) -> FundingType:
         """Get the current funding stage of the company."""
@@ -40,26 +44,48 @@ class LinkedInCompany(SerializableModel):
             return FundingType.UNKNOWN
         return self.funding_data[-1].funding_type
 
+    def _funding_timeline(self) -> tuple[list[date], list[Funding]]:
+        """Dated funding rounds in announcement order, and their dates.
+
+        Built on first use and rebuilt only when `funding_data` is replaced or
+        resized, so lookups can bisect instead of sorting on every call.
+        """
+        # Read through __pydantic_private__: plain private attribute access goes
+        # through BaseModel.__getattr__, which costs more than the lookup itself
+        index = self.__pydantic_private__["_funding_index"]
+        if (
+            index is None
+            or index[0] is not self.funding_data
+            or index[1] != len(self.funding_data)
+        ):
+            rounds = sorted(
+                (f for f in self.funding_data if f.announced_date),
+                key=lambda x: x.announced_date,
+            )
+            index = (
+                self.funding_data,
+                len(self.funding_data),
+                [f.announced_date for f in rounds],
+                rounds,
+            )
+            self._funding_index = index
+        return index[2], index[3]
+
     def get_funding_stage_at_date(self, target_date: date) -> FundingType:
         """Get the company's funding stage at a specific date."""
-        if not self.funding_data:
+        dates, rounds = self._funding_timeline()
+        position = bisect_right(dates, target_date)
+        if position == 0:
             return FundingType.UNKNOWN
+        return rounds[position - 1].funding_type
 
-        current_stage = FundingType.UNKNOWN
-
-        for funding in sorted(
-            [f for f in self.funding_data if f.announced_date],
-            key=lambda x: x.announced_date,
-        ):
-            try:
-                if funding.announced_date <= target_date:
-                    current_stage = funding.funding_type
-                else:
-                    break
-            except (ValueError, TypeError):
-                continue
-
-        return current_stage
+    def get_funding_rounds_between_dates(
+        self, start_date: date, end_date: date
+    ) -> list[Funding]:
+        """Funding rounds announced after `start_date` and up to `end_date`,
+        in announcement order."""
+        dates, rounds = self._funding_timeline()
+        return rounds[bisect_right(dates, start_date) : bisect_right(dates, end_date)]
 
     def get_funding_stages_between_dates(
         self, start_date: date, end_date: date = None, cutoff_date: date = None
@@ -75,33 +101,28 @@ class LinkedInCompany(SerializableModel):
             return []
 
         end_date = end_date or date.today()
-        relevant_rounds = []
-
-        # Filter funding data by cutoff date if provided
-        valid_funding = [
-            f
-            for f in self.funding_data
-            if f.announced_date and (not cutoff_date or f.announced_date) >= cutoff_date
-        ]
+        dates, rounds = self._funding_timeline()
 
-        if not valid_funding:
+        # Rounds announced on or after the cutoff date
+        first_valid = bisect_left(dates, cutoff_date) if cutoff_date else 0
+        if first_valid == len(dates):
             return [FundingType.UNKNOWN]
 
-        # Get initial stage from valid funding rounds
-        current_stage = self.get_funding_stage_at_date(start_date)
+        # Stage at the start date, from every dated round
+        started = bisect_right(dates, start_date)
+        current_stage = (
+            rounds[started - 1].funding_type if started else FundingType.UNKNOWN
+        )
 
-        for funding in sorted(valid_funding, key=lambda x: x.announced_date):
-            try:
-                funding_date = funding.announced_date
-                if start_date < funding_date <= end_date:
-                    stage = funding.funding_type
-                    if stage != current_stage:
-                        relevant_rounds.append(stage)
-                        current_stage = stage
-            except (ValueError, TypeError):
-                continue
+        stages = [current_stage]
+        first = max(first_valid, started)
+        for funding in rounds[first : bisect_right(dates, end_date)]:
+            stage = funding.funding_type
+            if stage != current_stage:
+                stages.append(stage)
+                current_stage = stage
 
-        return list(dict.fromkeys([current_stage] + relevant_rounds))
+        return list(dict.fromkeys(stages))
 
     def to_context_string(self) -> str:
         """Convert the company profile to a formatted string context."""
@@ -140,19 +161,9 @@ class LinkedInCompany(SerializableModel):
             if total_funding:
                 context += f"Total Funding: ${total_funding:,.0f}\n"
 
-            # Add latest funding round using proper date comparison
-            latest_funding = next(
-                (
-                    round
-                    for round in sorted(
-                        self.funding_data,
-                        key=lambda x: x.announced_date or date.min,
-                        reverse=True,
-                    )
-                    if round.announced_date
-                ),
-                None,
-            )
+            # Add latest funding round; the first listed if several share a date
+            dates, rounds = self._funding_timeline()
+            latest_funding = rounds[bisect_left(dates, dates[-1])] if rounds else None
 
             if latest_funding:
                 context += f"Latest Funding: {latest_funding.funding_type.value}"
@@ -213,63 +224,80 @@ class LinkedInProfile(SerializableModel):
     education: list[LinkedInEducation] = []
     career_metrics: CareerMetrics | None = None
 
+    _context_string: str | None = PrivateAttr(default=None)
+
     def to_context_string(self) -> str:
-        """Convert the profile to a formatted string context."""
-        context = ""
+        """Convert the profile to a formatted string context.
+
+        The result is cached on the instance; call `invalidate_context_string`
+        after mutating the profile or its experiences.
+        """
+        if self._context_string is None:
+            self._context_string = self._build_context_string()
+        return self._context_string
+
+    def get_entities(self) -> list[str]:
+        """Employers, schools, titles and locations mentioned in the profile."""
+        entities = [self.city, self.country]
+        for exp in self.experiences:
+            entities.extend([exp.company, exp.title, exp.location])
+        for edu in self.education:
+            entities.extend([edu.school, edu.field_of_study])
+        return list(dict.fromkeys(entity for entity in entities if entity))
+
+    def invalidate_context_string(self) -> None:
+        """Drop the cached context so the next call re-renders it."""
+        self._context_string = None
+
+    def _build_context_string(self) -> str:
+        parts = []
 
         if self.occupation:
-            context += f"Current Occupation: {self.occupation}\n\n---------\n"
+            parts.append(f"Current Occupation: {self.occupation}\n\n---------\n")
         if self.headline:
-            context += f"Headline: {self.headline}\n\n---------\n"
+            parts.append(f"Headline: {self.headline}\n\n---------\n")
         if self.summary:
-            context += f"Summary: {self.summary}\n\n---------\n"
+            parts.append(f"Summary: {self.summary}\n\n---------\n")
         if self.city and self.country:
-            context += f"Location of this candidate: {self.city}, {self.country}\n\n---------\n"
+            parts.append(
+                f"Location of this candidate: {self.city}, {self.country}\n\n---------\n"
+            )
 
         for exp in self.experiences:
-            context += f"Experience: {exp.title} at {exp.company}\n"
+            parts.append(f"Experience: {exp.title} at {exp.company}\n")
             if exp.description:
-                context += f"Description: {exp.description}\n"
+                parts.append(f"Description: {exp.description}\n")
             if exp.starts_at:
-                context += f"Start Year: {exp.starts_at.year}\n"
-                context += f"Start Month: {exp.starts_at.month}\n"
+                parts.append(f"Start Year: {exp.starts_at.year}\n")
+                parts.append(f"Start Month: {exp.starts_at.month}\n")
             if exp.ends_at:
-                context += f"End Year: {exp.ends_at.year}\n"
-                context += f"End Month: {exp.ends_at.month}\n"
+                parts.append(f"End Year: {exp.ends_at.year}\n")
+                parts.append(f"End Month: {exp.ends_at.month}\n")
 
             if exp.company_data:
-                context += exp.company_data.to_context_string()
+                parts.append(exp.company_data.to_context_string())
 
             if exp.summarized_job_description:
-                context += (
+                parts.append(
                     f"Role Summary: {exp.summarized_job_description.role_summary}\n"
                 )
-                context += f"Skills: {exp.summarized_job_description.skills}\n"
-                context += (
+                parts.append(f"Skills: {exp.summarized_job_description.skills}\n")
+                parts.append(
                     f"Requirements: {exp.summarized_job_description.requirements}\n"
                 )
-            context += "\n---------\n"
+            parts.append("\n---------\n")
 
         for edu in self.education:
             if edu.school and edu.degree_name and edu.field_of_study:
-                context += f"Education: {edu.school}; {edu.degree_name} in {edu.field_of_study}\n"
+                parts.append(
+                    f"Education: {edu.school}; {edu.degree_name} in {edu.field_of_study}\n"
+                )
                 if edu.starts_at:
-                    context += f"Start Year: {edu.starts_at.year}\n"
-                    context += f"Start Month: {edu.starts_at.month}\n"
+                    parts.append(f"Start Year: {edu.starts_at.year}\n")
+                    parts.append(f"Start Month: {edu.starts_at.month}\n")
                 if edu.ends_at:
-                    context += f"End Year: {edu.ends_at.year}\n"
-                    context += f"End Month: {edu.ends_at.month}\n"
-                context += "\n---------\n"
-
-        return context
-
-    def dict(self, *args, **kwargs) -> dict:
-        """Override dict to handle nested serialization properly."""
-        # Get base dictionary
-        d = super().dict(*args, **kwargs)
-
-        # Manually serialize experiences to ensure their custom dict() method is called
-        d["experiences"] = [exp.dict(*args, **kwargs) for exp in self.experiences]
-        d["education"] = [edu.dict(*args, **kwargs) for edu in self.education]
+                    parts.append(f"End Year: {edu.ends_at.year}\n")
+                    parts.append(f"End Month: {edu.ends_at.month}\n")
+                parts.append("\n---------\n")
 
-        return d
+        return "".join(parts)
@@ -1,4 +1,4 @@
-from typing import Annotated, Optional
+from typing import Annotated, Literal, Optional
 import operator
 from .linkedin import LinkedInProfile
 from .base import SearchQuery
@@ -13,8 +13,15 @@ class SearchState(SerializableModel):
     number_of_queries: int
     confidence_threshold: float = 0.8
     custom_instructions: Optional[str] = None
+    max_concurrent_validations: int = 10
+    lexical_score_threshold: float = 0.05
+    validation_mode: Literal["two_step", "combined"] = "two_step"
+    deadline_ms: Optional[int] = None
+    max_llm_calls: Optional[int] = None
+    max_tokens: Optional[int] = None
 
     # Intermediate
+    request_id: str = ""
     search_queries: list[SearchQuery] = []
     unvalidated_sources: dict[str, dict] = {}
     validated_sources: Annotated[list, operator.add] = []
@@ -22,6 +29,8 @@ class SearchState(SerializableModel):
     # Output
     citations: list[dict] = []
     source_str: str = ""
+    skipped: list[dict] = []
+    usage: Optional[dict] = None
 
 
 class SearchInputState(SerializableModel):
@@ -30,6 +39,47 @@ class SearchInputState(SerializableModel):
     number_of_queries: int
     confidence_threshold: float
     custom_instructions: Optional[str] = None
+    max_concurrent_validations: int = 10
+    lexical_score_threshold: float = 0.05
+    validation_mode: Literal["two_step", "combined"] = "two_step"
+    deadline_ms: Optional[int] = None
+    max_llm_calls: Optional[int] = None
+    max_tokens: Optional[int] = None
+
+
+class BatchSearchInputState(SerializableModel):
+    """One job screened against many candidate profiles."""
+
+    profiles: list[LinkedInProfile]
+    job: Job
+    number_of_queries: int
+    confidence_threshold: float
+    custom_instructions: Optional[str] = None
+    max_concurrent_validations: int = 10
+    lexical_score_threshold: float = 0.05
+    validation_mode: Literal["two_step", "combined"] = "two_step"
+    deadline_ms: Optional[int] = None
+    max_llm_calls: Optional[int] = None
+    max_tokens: Optional[int] = None
+
+    def to_search_inputs(self) -> list[SearchInputState]:
+        """Split the batch into one search input per profile, sharing the job."""
+        return [
+            SearchInputState(
+                profile=profile,
+                job=self.job,
+                number_of_queries=self.number_of_queries,
+                confidence_threshold=self.confidence_threshold,
+                custom_instructions=self.custom_instructions,
+                max_concurrent_validations=self.max_concurrent_validations,
+                lexical_score_threshold=self.lexical_score_threshold,
+                validation_mode=self.validation_mode,
+                deadline_ms=self.deadline_ms,
+                max_llm_calls=self.max_llm_calls,
+                max_tokens=self.max_tokens,
+            )
+            for profile in self.profiles
+        ]
 
 
 class EvaluationInputState(SerializableModel):
@@ -49,3 +99,21 @@ class OutputState(SerializableModel):
     source_str: str
     fit: int
     custom_instructions: Optional[str] = None
+    skipped: list[dict] = []
+    usage: Optional[dict] = None
+
+
+SearchEventType = Literal[
+    "queries_generated",
+    "search_completed",
+    "source_validated",
+    "citations_compiled",
+    "evaluation",
+]
+
+
+class SearchEvent(SerializableModel):
+    """Progress event streamed while a search runs."""
+
+    event: SearchEventType
+    data: dict = {}
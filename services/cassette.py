@@ -0,0 +1,136 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+
+class CassetteMiss(LookupError):
+    """A replayed call that was never recorded."""
+
+
+class Cassette:
+    """Records external calls to JSON files and replays them offline.
+
+    Each call is identified by its kind ("tavily", "llm", ...) and a JSON
+    request payload, and stored in `<directory>/<kind>/<hash>.json` with its
+    response and how long it took. In "record" mode calls go through and
+    their responses are saved, overwriting earlier recordings of the same
+    request. In "replay" mode responses are served from the files after the
+    recorded latency, or `latency_ms` if set, and unknown requests raise
+    `CassetteMiss`.
+    """
+
+    def __init__(self, directory: str, mode: str, latency_ms: Optional[float] = None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.directory = directory
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self._lock = threading.Lock()
+
+    def _path(self, kind: str, request: dict) -> str:
+        digest = hashlib.sha256(
+            json.dumps(request, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return os.path.join(self.directory, kind, f"{digest}.json")
+
+    def load(self, kind: str, request: dict) -> tuple[Any, float]:
+        """Recorded response and the delay in seconds to serve it after."""
+        path = self._path(kind, request)
+        try:
+            with open(path) as f:
+                recording = json.load(f)
+        except FileNotFoundError:
+            raise CassetteMiss(
+                f"No {kind} recording for {json.dumps(request)[:200]}"
+            ) from None
+        latency_ms = (
+            self.latency_ms if self.latency_ms is not None else recording["latency_ms"]
+        )
+        return recording["response"], latency_ms / 1000
+
+    def save(self, kind: str, request: dict, response: Any, latency: float) -> None:
+        path = self._path(kind, request)
+        recording = {
+            "kind": kind,
+            "request": request,
+            "response": response,
+            "latency_ms": round(latency * 1000, 1),
+        }
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename, so replays never see a partial file
+            with open(f"{path}.tmp", "w") as f:
+                json.dump(recording, f, default=str)
+            os.replace(f"{path}.tmp", path)
+
+
+def _build_cassette() -> Optional[Cassette]:
+    """Build the cassette selected by CASSETTE_MODE, if any."""
+    mode = os.getenv("CASSETTE_MODE", "off").lower()
+    if mode == "off":
+        return None
+    latency_ms = os.getenv("CASSETTE_LATENCY_MS")
+    logging.info(f"Cassette {mode} mode for external calls")
+    return Cassette(
+        directory=os.getenv("CASSETTE_DIR", ".cache/cassettes"),
+        mode=mode,
+        latency_ms=float(latency_ms) if latency_ms else None,
+    )
+
+
+cassette = _build_cassette()
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def replay_or_record(
+    kind: str,
+    request: dict,
+    call: Callable[[], Any],
+    encode: Callable[[Any], Any] = _identity,
+    decode: Callable[[Any], Any] = _identity,
+) -> Any:
+    """Run `call` through the cassette, or just run it when cassettes are off.
+
+    `encode` turns the response into JSON-compatible data for recording and
+    `decode` turns recorded data back into a response.
+    """
+    if cassette is None:
+        return call()
+    if cassette.mode == "replay":
+        response, delay = cassette.load(kind, request)
+        time.sleep(delay)
+        return decode(response)
+
+    start = time.monotonic()
+    response = call()
+    cassette.save(kind, request, encode(response), time.monotonic() - start)
+    return response
+
+
+async def replay_or_record_async(
+    kind: str,
+    request: dict,
+    call: Callable[[], Awaitable[Any]],
+    encode: Callable[[Any], Any] = _identity,
+    decode: Callable[[Any], Any] = _identity,
+) -> Any:
+    """Async `replay_or_record`."""
+    if cassette is None:
+        return await call()
+    if cassette.mode == "replay":
+        response, delay = cassette.load(kind, request)
+        await asyncio.sleep(delay)
+        return decode(response)
+
+    start = time.monotonic()
+    response = await call()
+    cassette.save(kind, request, encode(response), time.monotonic() - start)
+    return response
@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+from collections import deque
+
+
+class CircuitBreaker:
+    """Tracks the recent error rate and p95 latency of one model.
+
+    The breaker opens when either crosses its threshold over the last
+    `window_size` calls. While open, callers should route around the model.
+    After `open_seconds` a single probe call is let through: success closes the
+    breaker, failure keeps it open for another period, and a probe cancelled
+    before it answered lets the next call probe.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 50,
+        min_calls: int = 10,
+        error_rate_threshold: float = 0.5,
+        p95_latency_threshold: float = 30.0,
+        open_seconds: float = 30.0,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.p95_latency_threshold = p95_latency_threshold
+        self.open_seconds = open_seconds
+        self.state = self.CLOSED
+        self._calls: deque[tuple[float, bool]] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probe_started_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Whether a call to the model should be attempted right now."""
+        now = time.monotonic()
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if now - self._opened_at < self.open_seconds:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_started_at = now
+                return True
+            # Half-open: one probe at a time, unless the last one never reported
+            if now - self._probe_started_at >= self.open_seconds:
+                self._probe_started_at = now
+                return True
+            return False
+
+    def record(self, latency: float, error: bool) -> None:
+        """Record the outcome of a call and update the breaker state."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                if error:
+                    self._open()
+                else:
+                    self.state = self.CLOSED
+                    self._calls.clear()
+                return
+
+            self._calls.append((latency, error))
+            if self.state == self.CLOSED and self._should_open():
+                self._open()
+
+    def record_timeout(self, latency: float) -> None:
+        """Record a call abandoned after `latency` seconds without an answer,
+        e.g. one that lost a hedge race. Its real latency is unknown, so it
+        counts as at least the p95 threshold. A half-open probe that timed out
+        is left unresolved."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probe_started_at = 0.0
+                return
+
+            self._calls.append((max(latency, self.p95_latency_threshold), False))
+            if self.state == self.CLOSED and self._should_open():
+                self._open()
+
+    def record_cancelled(self) -> None:
+        """Note a call its caller cancelled, which says nothing about the
+        model. A cancelled half-open probe is left unresolved and the next
+        call probes instead."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probe_started_at = 0.0
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._calls.clear()
+
+    def _should_open(self) -> bool:
+        if len(self._calls) < self.min_calls:
+            return False
+        return (
+            self._error_rate() >= self.error_rate_threshold
+            or self._p95_latency() >= self.p95_latency_threshold
+        )
+
+    def _error_rate(self) -> float:
+        return sum(1 for _, error in self._calls if error) / len(self._calls)
+
+    def _p95_latency(self) -> float:
+        latencies = sorted(latency for latency, _ in self._calls)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "calls": len(self._calls),
+                "error_rate": self._error_rate() if self._calls else 0.0,
+                "p95_latency": self._p95_latency() if self._calls else 0.0,
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide breaker for a model, creating it on first use."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(
+                name,
+                window_size=int(os.getenv("LLM_BREAKER_WINDOW", 50)),
+                min_calls=int(os.getenv("LLM_BREAKER_MIN_CALLS", 10)),
+                error_rate_threshold=float(os.getenv("LLM_BREAKER_ERROR_RATE", 0.5)),
+                p95_latency_threshold=float(
+                    os.getenv("LLM_BREAKER_P95_SECONDS", 30.0)
+                ),
+                open_seconds=float(os.getenv("LLM_BREAKER_OPEN_SECONDS", 30.0)),
+            )
+        return _breakers[name]
@@ -1,11 +1,32 @@
 import asyncio
+import os
 from langsmith import traceable
-import requests
+import httpx
 from agent.get_secret import get_secret
+from services.cassette import replay_or_record_async
+from services.search_provider import SearchProvider
 
 
 url = "https://api.exa.ai/search"
 
+_exa_client: httpx.AsyncClient | None = None
+
+
+def get_exa_client() -> httpx.AsyncClient:
+    """Pooled HTTP client shared by every Exa search in the process."""
+    global _exa_client
+    if _exa_client is None:
+        _exa_client = httpx.AsyncClient(
+            headers={
+                "x-api-key": get_secret("exa-api-key", "1"),
+                "Content-Type": "application/json",
+            },
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+            timeout=httpx.Timeout(30.0),
+        )
+    return _exa_client
+
+
 @traceable(name="exa_search_async")
 async def exa_search_async(queries):
     search_tasks = []
@@ -27,10 +48,37 @@ async def _single_exa_search(query):
             "livecrawl": "never",
         }
     }
-    headers = {
-        "x-api-key": get_secret("exa-api-key", "1"),
-        "Content-Type": "application/json"
-    }
 
-    response = requests.request("POST", url, json=payload, headers=headers)
-    return response.json()
+    async def post():
+        response = await get_exa_client().post(url, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    return await replay_or_record_async("exa", payload, post)
+
+
+class ExaSearchProvider(SearchProvider):
+    name = "exa"
+
+    def __init__(self, timeout: float = float(os.getenv("EXA_TIMEOUT_SECONDS", 30))):
+        super().__init__(timeout)
+
+    async def search(self, query: str) -> dict:
+        """Search Exa and convert its results to Tavily's shape."""
+        response = await _single_exa_search(query)
+        return {
+            "query": query,
+            "results": [
+                {
+                    "url": result["url"],
+                    "title": result.get("title") or "",
+                    "content": (result.get("text") or "")[:500],
+                    "raw_content": result.get("text"),
+                    "score": result.get("score"),
+                }
+                for result in response.get("results", [])
+            ],
+        }
+
+    def warm_up(self) -> None:
+        get_exa_client()
@@ -1,82 +1,464 @@
-from typing import Optional, Any
-from openai import AzureOpenAI
-from langchain_openai import AzureChatOpenAI
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
 from langchain_core.language_models import BaseLanguageModel
 from agent.get_secret import get_secret
-from langchain_google_vertexai import ChatVertexAI
+from services.cache import InMemoryTTLCache, SQLiteTTLCache
+from services.cassette import replay_or_record, replay_or_record_async
+from services.circuit_breaker import get_circuit_breaker
+from services.metrics import (
+    llm_call_duration_seconds,
+    llm_calls_total,
+    llm_fallbacks_total,
+    register_cache,
+)
 
 
-openai_4o = AzureChatOpenAI(
-    deployment_name="gpt-4o",
-    openai_api_version="2024-08-01-preview",
-    azure_endpoint=get_secret("azure-openai-endpoint", "2"),
-    openai_api_key=get_secret("azure-openai-api-key", "2"),
-    temperature=0,
-    max_retries=5,
-)
+class LazyModel:
+    """A chat model that is built on first use.
+
+    Provider SDKs are imported and clients constructed inside `factory`, so
+    importing this module stays cheap and doesn't touch the network.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], BaseLanguageModel]):
+        self.name = name
+        self.factory = factory
+        self._model = None
+        self._lock = threading.Lock()
+
+    def get(self) -> BaseLanguageModel:
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self.factory()
+        return self._model
+
+
+def _azure_chat_openai(deployment_name: str) -> BaseLanguageModel:
+    from langchain_openai import AzureChatOpenAI
+
+    return AzureChatOpenAI(
+        deployment_name=deployment_name,
+        openai_api_version="2024-08-01-preview",
+        azure_endpoint=get_secret("azure-openai-endpoint", "2"),
+        openai_api_key=get_secret("azure-openai-api-key", "2"),
+        temperature=0,
+        # One retry for transient errors; a model that keeps failing is left
+        # to its circuit breaker and the fallbacks rather than retried for
+        # minutes
+        max_retries=1,
+    )
+
 
-openai_4o_mini = AzureChatOpenAI(
-    deployment_name="gpt-4o-mini",
-    openai_api_version="2024-08-01-preview",
-    azure_endpoint=get_secret("azure-openai-endpoint", "2"),
-    openai_api_key=get_secret("azure-openai-api-key", "2"),
-    temperature=0,
-    max_retries=5,
+def _chat_vertex_ai(model: str) -> BaseLanguageModel:
+    from langchain_google_vertexai import ChatVertexAI
+
+    return ChatVertexAI(model=model)
+
+
+openai_4o = LazyModel("gpt-4o", lambda: _azure_chat_openai("gpt-4o"))
+
+openai_4o_mini = LazyModel("gpt-4o-mini", lambda: _azure_chat_openai("gpt-4o-mini"))
+
+gemini_2_flash = LazyModel(
+    "gemini-2.0-flash-001", lambda: _chat_vertex_ai("gemini-2.0-flash-001")
 )
 
-gemini_2_flash = ChatVertexAI(
-    model="gemini-2.0-flash-001",
+
+def resolve_model(model) -> BaseLanguageModel:
+    """Build a `LazyModel` if needed; other models are returned unchanged."""
+    return model.get() if isinstance(model, LazyModel) else model
+
+
+def _build_llm_cache():
+    """Build the structured-output cache selected by LLM_CACHE_BACKEND, if any."""
+    backend = os.getenv("LLM_CACHE_BACKEND", "").lower()
+    ttl_seconds = float(os.getenv("LLM_CACHE_TTL_SECONDS", 24 * 60 * 60))
+    max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 10000))
+
+    if backend == "memory":
+        return InMemoryTTLCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
+    if backend == "sqlite":
+        return SQLiteTTLCache(
+            path=os.getenv("LLM_CACHE_PATH", ".cache/llm.sqlite3"),
+            ttl_seconds=ttl_seconds,
+            max_entries=max_entries,
+            table="llm_responses",
+        )
+    return None
+
+
+llm_cache = _build_llm_cache()
+register_cache("llm", llm_cache)
+
+# Call sites whose structured outputs may be served from `llm_cache`
+LLM_CACHE_CALL_SITES = set(
+    filter(
+        None,
+        os.getenv(
+            "LLM_CACHE_CALL_SITES",
+            "llm_validator,job_description_llm_validator,"
+            "distill_human,distill_job_description,llm_validate_and_distill",
+        ).split(","),
+    )
 )
 
 
+def model_name(model: BaseLanguageModel) -> str:
+    """Deployment or model name used to tell models apart in caches and logs."""
+    if isinstance(model, LazyModel):
+        return model.name
+    return (
+        getattr(model, "deployment_name", None)
+        or getattr(model, "model_name", None)
+        or getattr(model, "model", None)
+        or type(model).__name__
+    )
+
+
+# Cancellation message for the call still running when the other model of a
+# hedged request answered first
+LOST_HEDGE = "lost_hedge"
+
+
 class LLMWithFallbacks:
+    """Primary model with ordered fallbacks.
+
+    Each model has a circuit breaker; while the primary's breaker is open,
+    calls go straight to the fallbacks. With `hedge_after_seconds` set, async
+    calls also start the first fallback once the primary has been running that
+    long and return whichever answers first.
+    """
+
     def __init__(
-        self, primary_llm: BaseLanguageModel, fallbacks: list[BaseLanguageModel]
+        self,
+        primary_llm: BaseLanguageModel | LazyModel,
+        fallbacks: list[BaseLanguageModel | LazyModel],
+        hedge_after_seconds: float = None,
     ):
         self.primary_llm = primary_llm
         self.fallbacks = fallbacks
+        self.hedge_after_seconds = hedge_after_seconds
 
-    def with_structured_output(self, cls):
-        return StructuredLLMWithFallbacks(self, cls)
+    def with_structured_output(self, cls, cache_site: str = None):
+        return StructuredLLMWithFallbacks(self, cls, cache_site=cache_site)
 
     def invoke(self, *args, **kwargs):
+        output, _ = self.invoke_with_fallbacks(lambda model: model, *args, **kwargs)
+        return output
+
+    async def ainvoke(self, *args, **kwargs):
+        output, _ = await self.ainvoke_with_fallbacks(
+            lambda model: model, *args, **kwargs
+        )
+        return output
+
+    def _models_to_try(self) -> Iterator[BaseLanguageModel]:
+        """Models whose breakers allow a call, primary first.
+
+        A breaker is only asked when its model is about to be called, so
+        fallbacks that are never reached don't use up a half-open breaker's
+        single probe.
+        """
+        models = [self.primary_llm] + self.fallbacks
+        tried = False
+        for model in models:
+            if get_circuit_breaker(model_name(model)).allow_request():
+                if not tried and model is not self.primary_llm:
+                    self._record_fallback("breaker_open")
+                tried = True
+                yield model
+        if not tried:
+            # Every breaker is open: try the chain anyway rather than fail outright
+            yield from models
+
+    def _record_fallback(self, reason: str) -> None:
+        llm_fallbacks_total.labels(model_name(self.primary_llm), reason).inc()
+
+    def _record_call(self, name: str, latency: float, outcome: str) -> None:
+        """Count a model call in its circuit breaker and in the metrics."""
+        breaker = get_circuit_breaker(name)
+        if outcome == "lost_hedge":
+            breaker.record_timeout(latency)
+        elif outcome == "cancelled":
+            breaker.record_cancelled()
+        else:
+            breaker.record(latency, error=outcome == "error")
+        # Both kinds of cancellation are `cancelled` in the metrics
+        outcome = "cancelled" if outcome == "lost_hedge" else outcome
+        llm_calls_total.labels(name, outcome).inc()
+        llm_call_duration_seconds.labels(name).observe(latency)
+
+    def invoke_with_fallbacks(
+        self, make_runnable: Callable, *args, **kwargs
+    ) -> tuple[Any, str]:
+        """Invoke `make_runnable(model)` down the chain until one succeeds.
+        Returns the output and the name of the model that produced it."""
+        first_error = None
+        for model in self._models_to_try():
+            if first_error is not None:
+                self._record_fallback("error")
+            name = model_name(model)
+            start = time.monotonic()
+            try:
+                output = make_runnable(resolve_model(model)).invoke(*args, **kwargs)
+            except Exception as e:
+                self._record_call(name, time.monotonic() - start, "error")
+                logging.warning(f"LLM call to {name} failed: {e}")
+                first_error = first_error or e
+                continue
+            self._record_call(name, time.monotonic() - start, "ok")
+            return output, name
+        raise first_error
+
+    async def _ainvoke_model(self, model, make_runnable: Callable, *args, **kwargs):
+        name = model_name(model)
+        start = time.monotonic()
         try:
-            return self.primary_llm.invoke(*args, **kwargs)
+            output = await make_runnable(resolve_model(model)).ainvoke(*args, **kwargs)
+        except asyncio.CancelledError as e:
+            # Losing a hedge race means the model didn't answer in time;
+            # any other cancellation came from the caller
+            outcome = "lost_hedge" if e.args == (LOST_HEDGE,) else "cancelled"
+            self._record_call(name, time.monotonic() - start, outcome)
+            raise
         except Exception as e:
-            for fallback in self.fallbacks:
-                try:
-                    return fallback.invoke(*args, **kwargs)
-                except Exception:
-                    continue
-            raise e
+            self._record_call(name, time.monotonic() - start, "error")
+            logging.warning(f"LLM call to {name} failed: {e}")
+            raise
+        self._record_call(name, time.monotonic() - start, "ok")
+        return output, name
+
+    async def ainvoke_with_fallbacks(
+        self, make_runnable: Callable, *args, **kwargs
+    ) -> tuple[Any, str]:
+        """Async `invoke_with_fallbacks`, hedging the first two models if enabled."""
+        models = self._models_to_try()
+        first_error = None
+
+        if self.hedge_after_seconds is not None:
+            try:
+                return await self._ainvoke_hedged(
+                    models, make_runnable, *args, **kwargs
+                )
+            except Exception as e:
+                first_error = e
+
+        for model in models:
+            if first_error is not None:
+                self._record_fallback("error")
+            try:
+                return await self._ainvoke_model(model, make_runnable, *args, **kwargs)
+            except Exception as e:
+                first_error = first_error or e
+        raise first_error
+
+    async def _ainvoke_hedged(
+        self, models: Iterator, make_runnable: Callable, *args, **kwargs
+    ) -> tuple[Any, str]:
+        """Call the next model of `models`, start the one after it if the first
+        hasn't answered within the hedge delay (or failed), and return the
+        first successful answer. Cancelling the call cancels both."""
+        pending = {
+            asyncio.create_task(
+                self._ainvoke_model(next(models), make_runnable, *args, **kwargs)
+            )
+        }
+        first_error = None
+        answered = False
+        try:
+            done, pending = await asyncio.wait(
+                pending, timeout=self.hedge_after_seconds
+            )
+            for task in done:
+                if task.exception() is None:
+                    answered = True
+                    return task.result()
+                first_error = task.exception()
+
+            hedge_model = next(models, None)
+            if hedge_model is not None:
+                self._record_fallback("hedge" if first_error is None else "error")
+                pending.add(
+                    asyncio.create_task(
+                        self._ainvoke_model(hedge_model, make_runnable, *args, **kwargs)
+                    )
+                )
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        answered = True
+                        return task.result()
+                    first_error = first_error or task.exception()
+        finally:
+            for task in pending:
+                task.cancel(LOST_HEDGE if answered else None)
+        raise first_error
+
+
+# Call site of the structured LLM call running in this context, so callbacks
+# can attribute token usage to it
+llm_call_site: ContextVar[Optional[str]] = ContextVar("llm_call_site", default=None)
 
 
 class StructuredLLMWithFallbacks:
-    def __init__(self, llm_with_fallbacks: LLMWithFallbacks, cls: Any):
+    """Structured output from an `LLMWithFallbacks`.
+
+    `cache_site` names the call site: it selects whether `llm_cache` is used
+    and is what token usage is reported under.
+    """
+
+    def __init__(
+        self, llm_with_fallbacks: LLMWithFallbacks, cls: Any, cache_site: str = None
+    ):
         self.llm_with_fallbacks = llm_with_fallbacks
         self.cls = cls
+        self.cache_site = cache_site
+        self.cache = llm_cache if cache_site in LLM_CACHE_CALL_SITES else None
 
-    def invoke(self, *args, **kwargs):
-        primary = self.llm_with_fallbacks.primary_llm.with_structured_output(self.cls)
+    def _structured(self, model: BaseLanguageModel):
+        return model.with_structured_output(self.cls)
+
+    def _request(self, messages) -> dict:
+        """The message list, the output schema and the primary deployment."""
+        return {
+            "messages": [
+                [message.type, message.content]
+                if hasattr(message, "content")
+                else str(message)
+                for message in messages
+            ],
+            "schema": self.cls.model_json_schema(),
+            "model": model_name(self.llm_with_fallbacks.primary_llm),
+        }
+
+    def _cache_key(self, request: dict) -> str:
+        return hashlib.sha256(
+            json.dumps(request, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def _get_cached(self, cache_key: str):
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            return None
+        logging.debug(
+            f"LLM cache hit for {self.cache_site}, produced by {cached['model']}"
+        )
+        return self.cls.model_validate(cached["output"])
+
+    def _set_cached(self, cache_key: str, output, model: str) -> None:
+        if output is None:
+            return
+        self.cache.set(
+            cache_key, {"model": model, "output": output.model_dump(mode="json")}
+        )
+
+    def _encode(self, output):
+        return output.model_dump(mode="json") if output is not None else None
+
+    def _decode(self, data):
+        return self.cls.model_validate(data) if data is not None else None
+
+    def invoke(self, messages, *args, **kwargs):
+        """Structured output for `messages`, through the cassette if one is in
+        use, then the cache, then the models."""
+        request = self._request(messages)
+        token = llm_call_site.set(self.cache_site)
         try:
-            return primary.invoke(*args, **kwargs)
-        except Exception as e:
-            for fallback in self.llm_with_fallbacks.fallbacks:
-                try:
-                    fallback_structured = fallback.with_structured_output(self.cls)
-                    return fallback_structured.invoke(*args, **kwargs)
-                except Exception:
-                    continue
-            raise e
+            return replay_or_record(
+                "llm",
+                request,
+                lambda: self._invoke(request, messages, *args, **kwargs),
+                encode=self._encode,
+                decode=self._decode,
+            )
+        finally:
+            llm_call_site.reset(token)
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        request = self._request(messages)
+        token = llm_call_site.set(self.cache_site)
+        try:
+            return await replay_or_record_async(
+                "llm",
+                request,
+                lambda: self._ainvoke(request, messages, *args, **kwargs),
+                encode=self._encode,
+                decode=self._decode,
+            )
+        finally:
+            llm_call_site.reset(token)
+
+    def _invoke(self, request: dict, messages, *args, **kwargs):
+        cache_key = self._cache_key(request) if self.cache is not None else None
+        if cache_key:
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                return cached
+
+        output, model = self.llm_with_fallbacks.invoke_with_fallbacks(
+            self._structured, messages, *args, **kwargs
+        )
+
+        if cache_key:
+            self._set_cached(cache_key, output, model)
+        return output
+
+    async def _ainvoke(self, request: dict, messages, *args, **kwargs):
+        cache_key = self._cache_key(request) if self.cache is not None else None
+        # The SQLite cache does disk I/O, so keep it off the event loop
+        if cache_key:
+            cached = await asyncio.to_thread(self._get_cached, cache_key)
+            if cached is not None:
+                return cached
+
+        output, model = await self.llm_with_fallbacks.ainvoke_with_fallbacks(
+            self._structured, messages, *args, **kwargs
+        )
+
+        if cache_key:
+            await asyncio.to_thread(self._set_cached, cache_key, output, model)
+        return output
 
 
-llm = LLMWithFallbacks(openai_4o, [gemini_2_flash])
-llm_fast = LLMWithFallbacks(openai_4o_mini, [gemini_2_flash])
+LLM_HEDGE_AFTER_SECONDS = (
+    float(os.getenv("LLM_HEDGE_AFTER_SECONDS"))
+    if os.getenv("LLM_HEDGE_AFTER_SECONDS")
+    else None
+)
+
+llm = LLMWithFallbacks(
+    openai_4o, [gemini_2_flash], hedge_after_seconds=LLM_HEDGE_AFTER_SECONDS
+)
+llm_fast = LLMWithFallbacks(
+    openai_4o_mini, [gemini_2_flash], hedge_after_seconds=LLM_HEDGE_AFTER_SECONDS
+)
+
 
+def get_azure_openai():
+    from openai import AzureOpenAI
 
-def get_azure_openai() -> Optional[AzureOpenAI]:
     return AzureOpenAI(
         api_key=get_secret("azure-openai-api-key", "1"),
         api_version="2024-08-01-preview",
         azure_endpoint=get_secret("azure-openai-endpoint", "1"),
     )
+
+
+def warm_up_llms() -> None:
+    """Build every chat model now instead of on the first request."""
+    for model in (openai_4o, openai_4o_mini, gemini_2_flash):
+        try:
+            model.get()
+        except Exception as e:
+            logging.warning(f"Could not warm up {model.name}: {e}")
@@ -0,0 +1,139 @@
+import functools
+import inspect
+import time
+from typing import Callable
+from prometheus_client import Counter, Histogram, make_asgi_app
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import REGISTRY, Collector
+
+# LLM calls and searches take seconds; the fast end covers cache hits
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+SOURCE_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 30, 50, 75, 100, 150, 200)
+
+node_duration_seconds = Histogram(
+    "graph_node_duration_seconds",
+    "Duration of one run of a search graph node",
+    ["node"],
+    buckets=LATENCY_BUCKETS,
+)
+sources_fanned_out = Histogram(
+    "sources_fanned_out_per_request",
+    "Sources sent to validation by one search",
+    buckets=SOURCE_COUNT_BUCKETS,
+)
+sources_accepted = Histogram(
+    "sources_accepted_per_request",
+    "Sources accepted by validation in one search",
+    buckets=SOURCE_COUNT_BUCKETS,
+)
+search_calls_total = Counter(
+    "search_calls_total",
+    "Searches by provider and outcome (ok, error or timeout)",
+    ["provider", "outcome"],
+)
+search_duration_seconds = Histogram(
+    "search_duration_seconds",
+    "Duration of one search, including retries and cache lookups",
+    ["provider"],
+    buckets=LATENCY_BUCKETS,
+)
+llm_calls_total = Counter(
+    "llm_calls_total",
+    "Chat model calls by model and outcome (ok, error or cancelled)",
+    ["model", "outcome"],
+)
+llm_call_duration_seconds = Histogram(
+    "llm_call_duration_seconds",
+    "Duration of one chat model call",
+    ["model"],
+    buckets=LATENCY_BUCKETS,
+)
+llm_fallbacks_total = Counter(
+    "llm_fallbacks_total",
+    "Calls routed past the primary model, by reason (breaker_open, error or hedge)",
+    ["primary_model", "reason"],
+)
+llm_tokens_total = Counter(
+    "llm_tokens_total",
+    "Tokens used by structured LLM calls, by call site and kind "
+    "(input, output or cached input)",
+    ["call_site", "kind"],
+)
+retries_total = Counter(
+    "retries_total",
+    "Retries made by exponential_backoff_retry",
+    ["operation"],
+)
+
+
+def timed_node(name: str, node: Callable) -> Callable:
+    """Wrap a graph node so each run is observed in `graph_node_duration_seconds`."""
+    histogram = node_duration_seconds.labels(name)
+
+    if inspect.iscoroutinefunction(node):
+
+        @functools.wraps(node)
+        async def timed_async_node(*args, **kwargs):
+            start = time.monotonic()
+            try:
+                return await node(*args, **kwargs)
+            finally:
+                histogram.observe(time.monotonic() - start)
+
+        return timed_async_node
+
+    @functools.wraps(node)
+    def timed_sync_node(*args, **kwargs):
+        start = time.monotonic()
+        try:
+            return node(*args, **kwargs)
+        finally:
+            histogram.observe(time.monotonic() - start)
+
+    return timed_sync_node
+
+
+class CacheCollector(Collector):
+    """Exports the hit and miss counters and size of registered caches.
+
+    Reads each cache's `stats()` when scraped, so cache lookups themselves
+    don't pay for metrics.
+    """
+
+    def __init__(self):
+        self.caches = {}
+
+    def collect(self):
+        hits = CounterMetricFamily(
+            "cache_hits", "Cache lookups that found a fresh entry", labels=["cache"]
+        )
+        misses = CounterMetricFamily(
+            "cache_misses", "Cache lookups that found nothing", labels=["cache"]
+        )
+        entries = GaugeMetricFamily(
+            "cache_entries", "Entries currently cached", labels=["cache"]
+        )
+        for name, cache in self.caches.items():
+            stats = cache.stats()
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            entries.add_metric([name], stats["size"])
+        yield hits
+        yield misses
+        yield entries
+
+
+_cache_collector = CacheCollector()
+REGISTRY.register(_cache_collector)
+
+
+def register_cache(name: str, cache) -> None:
+    """Export the stats of a cache with the `stats()` interface of
+    `services.cache`. Does nothing for a disabled (None) cache."""
+    if cache is not None:
+        _cache_collector.caches[name] = cache
+
+
+def metrics_app():
+    """ASGI app serving the metrics in the Prometheus text format."""
+    return make_asgi_app()
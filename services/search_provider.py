@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+from langsmith import traceable
+from services.metrics import search_calls_total, search_duration_seconds
+
+
+class SearchProvider(ABC):
+    """A web search backend.
+
+    `search` returns a response in Tavily's shape,
+    {"query": ..., "results": [{"url", "title", "content", "raw_content",
+    "score"}, ...]}, so every provider feeds `deduplicate_and_format_sources`
+    the same way.
+    """
+
+    name: str
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+
+    @abstractmethod
+    async def search(self, query: str) -> dict:
+        """Run a single query."""
+
+    def warm_up(self) -> None:
+        """Create clients ahead of the first search."""
+
+
+async def _search_with_timeout(provider: SearchProvider, query: str) -> dict:
+    """Run one query on one provider; errors and timeouts yield no results."""
+    start = time.monotonic()
+    try:
+        response = await asyncio.wait_for(provider.search(query), provider.timeout)
+    except asyncio.TimeoutError:
+        logging.warning(
+            f"{provider.name} search timed out after {provider.timeout}s: {query}"
+        )
+        search_calls_total.labels(provider.name, "timeout").inc()
+        return {"query": query, "provider": provider.name, "results": []}
+    except Exception as e:
+        logging.warning(f"{provider.name} search failed for {query}: {e}")
+        search_calls_total.labels(provider.name, "error").inc()
+        return {"query": query, "provider": provider.name, "results": []}
+    search_calls_total.labels(provider.name, "ok").inc()
+    search_duration_seconds.labels(provider.name).observe(time.monotonic() - start)
+
+    response["query"] = query
+    response["provider"] = provider.name
+    for result in response["results"]:
+        result["provider"] = provider.name
+    return response
+
+
+@traceable(name="multi_provider_search")
+async def multi_provider_search(
+    search_queries,
+    providers: list[SearchProvider],
+    on_result: Optional[Callable[[dict], None]] = None,
+    timeout: Optional[float] = None,
+) -> list[dict]:
+    """Run every query on every provider concurrently.
+
+    Each provider is bounded by its own timeout, so a slow provider only loses
+    its own results. `on_result` is called with each response as it arrives.
+    Searches still running after `timeout` seconds are cancelled and return
+    no results, with `timed_out` set.
+    """
+
+    async def search(provider: SearchProvider, query_str: str) -> dict:
+        response = await _search_with_timeout(provider, query_str)
+        if on_result is not None:
+            on_result(response)
+        return response
+
+    searches = [
+        (provider, query.search_query)
+        for query in search_queries
+        for provider in providers
+    ]
+    if not searches:
+        return []
+    search_tasks = [
+        asyncio.ensure_future(search(provider, query_str))
+        for provider, query_str in searches
+    ]
+    _, pending = await asyncio.wait(search_tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+
+    return [
+        (
+            task.result()
+            if task not in pending
+            else {
+                "query": query_str,
+                "provider": provider.name,
+                "results": [],
+                "timed_out": True,
+            }
+        )
+        for (provider, query_str), task in zip(searches, search_tasks)
+    ]
@@ -1,22 +1,59 @@
-from tavily import AsyncTavilyClient
 import asyncio
 from langsmith import traceable
 from agent.get_secret import get_secret
+from services.cache import SQLiteTTLCache
+from services.cassette import replay_or_record_async
+from services.metrics import register_cache, retries_total
+from services.search_provider import SearchProvider
+import json
 import logging
+import os
 from typing import Any
 import random
 
 
-tavily_async_client = AsyncTavilyClient(
-    api_key=get_secret("tavily-api-key", "1")
+_tavily_async_client = None
+
+
+def get_tavily_client():
+    """Tavily client shared by the process, created on first use."""
+    global _tavily_async_client
+    if _tavily_async_client is None:
+        from tavily import AsyncTavilyClient
+
+        _tavily_async_client = AsyncTavilyClient(
+            api_key=get_secret("tavily-api-key", "1"),
+            api_base_url=os.getenv("TAVILY_API_BASE_URL"),
+        )
+    return _tavily_async_client
+
+TAVILY_MAX_RESULTS = 5
+
+tavily_cache = (
+    SQLiteTTLCache(
+        path=os.getenv("TAVILY_CACHE_PATH", ".cache/tavily.sqlite3"),
+        ttl_seconds=float(os.getenv("TAVILY_CACHE_TTL_SECONDS", 24 * 60 * 60)),
+        max_entries=int(os.getenv("TAVILY_CACHE_MAX_ENTRIES", 10000)),
+        table="tavily_search",
+    )
+    if os.getenv("TAVILY_CACHE_ENABLED", "true").lower() == "true"
+    else None
 )
+register_cache("tavily", tavily_cache)
+
+
+def tavily_cache_key(query_str: str, **params) -> str:
+    """Build a cache key from the normalized query and the search parameters."""
+    normalized_query = " ".join(query_str.lower().split())
+    return json.dumps({"query": normalized_query, **params}, sort_keys=True)
 
 async def exponential_backoff_retry(
     coroutine_func,
     max_retries: int = 3,
     base_delay: float = 1.0,
     max_delay: float = 10.0,
-    exceptions=(Exception,)
+    exceptions=(Exception,),
+    operation: str = "unknown",
 ) -> Any:
     """
     Executes a coroutine with exponential backoff retry logic.
@@ -27,6 +64,7 @@ async def exponential_backoff_retry(
         base_delay: Initial delay between retries in seconds
         max_delay: Maximum delay between retries in seconds
         exceptions: Tuple of exceptions to catch and retry on
+        operation: Name under which retries are counted in `retries_total`
     """
     for attempt in range(max_retries + 1):
         try:
@@ -35,26 +73,52 @@ async def exponential_backoff_retry(
             if attempt == max_retries:
                 raise e
             
+            retries_total.labels(operation).inc()
             delay = min(base_delay * (2 ** attempt) + random.uniform(0, 0.1), max_delay)
             logging.warning(f"Attempt {attempt + 1} failed. Retrying in {delay:.2f} seconds... Error: {str(e)}")
             await asyncio.sleep(delay)
 
-@traceable(name="tavily_search_async")
-async def tavily_search_async(search_queries):
-    """Performs concurrent web searches using the Tavily API."""
-    search_tasks = []
-    for query in search_queries:
-        query_str = query.search_query
-        # Wrap individual search in a traceable function
-        search_tasks.append(_single_tavily_search(query_str))
-    return await asyncio.gather(*search_tasks)
-
 @traceable(name="single_tavily_search")
 async def _single_tavily_search(query_str):
-    """Performs a single web search using the Tavily API with retry logic."""
-    return await exponential_backoff_retry(
-        lambda: tavily_async_client.search(query_str, max_results=5, include_raw_content=True),
+    """Performs a single web search using the Tavily API with retry logic.
+    Responses are served from `tavily_cache` when a fresh entry exists, and
+    recorded or replayed when a cassette is in use."""
+    params = {"max_results": TAVILY_MAX_RESULTS, "include_raw_content": True}
+    return await replay_or_record_async(
+        "tavily",
+        {"query": query_str, **params},
+        lambda: _cached_tavily_search(query_str, params),
+    )
+
+async def _cached_tavily_search(query_str, params):
+    cache_key = tavily_cache_key(query_str, **params)
+    if tavily_cache is not None:
+        cached = await asyncio.to_thread(tavily_cache.get, cache_key)
+        if cached is not None:
+            cached["query"] = query_str
+            return cached
+
+    response = await exponential_backoff_retry(
+        lambda: get_tavily_client().search(query_str, **params),
         max_retries=3,
         base_delay=1.0,
-        max_delay=10.0
+        max_delay=10.0,
+        operation="tavily_search",
     )
+
+    if tavily_cache is not None:
+        await asyncio.to_thread(tavily_cache.set, cache_key, response)
+    return response
+
+
+class TavilySearchProvider(SearchProvider):
+    name = "tavily"
+
+    def __init__(self, timeout: float = float(os.getenv("TAVILY_TIMEOUT_SECONDS", 30))):
+        super().__init__(timeout)
+
+    async def search(self, query: str) -> dict:
+        return await _single_tavily_search(query)
+
+    def warm_up(self) -> None:
+        get_tavily_client()
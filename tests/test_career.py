@@ -0,0 +1,18 @@
+from models.career import KeywordMatcher, TechStack, TechStackPatterns
+
+
+def test_plural_keywords_detect_their_stack():
+    assert TechStackPatterns.detect_tech_stacks("Built public APIs") == {
+        TechStack.BACKEND
+    }
+    assert TechStack.DATA in TechStackPatterns.detect_tech_stacks(
+        "Owned the data pipelines"
+    )
+
+
+def test_keywords_still_match_whole_words_only():
+    matcher = KeywordMatcher({"ai": {"ML/AI"}, ".net": {"Backend"}})
+
+    assert matcher.match("Led the AI platform") == {"ML/AI"}
+    assert matcher.match("Domain expert in retail") == set()
+    assert matcher.match("Migrated two .NETs apps") == {"Backend"}
@@ -0,0 +1,48 @@
+import asyncio
+import time
+from langchain_core.runnables import RunnableLambda
+from services.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from services.llms import LazyModel, LLMWithFallbacks
+
+
+def make_model(name: str, seconds: float) -> LazyModel:
+    async def answer(_):
+        await asyncio.sleep(seconds)
+        return name
+
+    return LazyModel(name, lambda: RunnableLambda(answer))
+
+
+def test_slow_primary_opens_its_breaker_when_hedged(monkeypatch):
+    monkeypatch.setenv("LLM_BREAKER_P95_SECONDS", "0.3")
+    llm = LLMWithFallbacks(
+        make_model("slow-primary", 5.0),
+        [make_model("fast-fallback", 0.01)],
+        hedge_after_seconds=0.05,
+    )
+
+    async def run():
+        for _ in range(20):
+            assert await llm.ainvoke("question") == "fast-fallback"
+            # Let the cancelled primary call record its outcome
+            await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    assert get_circuit_breaker("slow-primary").state == CircuitBreaker.OPEN
+    assert get_circuit_breaker("fast-fallback").state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_probe_leaves_breaker_half_open():
+    breaker = CircuitBreaker("probe", min_calls=1, open_seconds=0.05)
+    breaker.record(1.0, error=True)
+    assert breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.05)
+
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_cancelled()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # The cancelled probe didn't answer, so the next call probes instead
+    assert breaker.allow_request()
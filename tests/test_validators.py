@@ -0,0 +1,35 @@
+from agent.validators import heuristic_validator, rank_sources_lexically
+
+
+def make_source(url: str, title: str, raw_content: str) -> dict:
+    return {
+        "url": url,
+        "title": title,
+        "raw_content": raw_content,
+        "is_job_description": False,
+    }
+
+
+def test_name_in_title_without_profile_entities_is_dropped():
+    people_search = make_source(
+        "https://people.example.com/jane-doe",
+        "Jane Doe - People Search",
+        "Find phone numbers, addresses and relatives for Jane Doe.",
+    )
+    talk = make_source(
+        "https://conf.example.com/talks/payments",
+        "Scaling payments at Stripe",
+        "Jane Doe, staff engineer at Stripe, on payments infrastructure.",
+    )
+    sources = {source["url"]: source for source in (people_search, talk)}
+    # Without pre-ranking, the title alone would send it to the LLM validator
+    assert heuristic_validator(
+        people_search["raw_content"], people_search["title"], "Jane Doe"
+    )
+
+    ranked = rank_sources_lexically(
+        sources, ["Stripe", "Staff Engineer", "Dublin"], min_score=0.05
+    )
+
+    assert list(ranked) == [talk["url"]]
+    assert ranked[talk["url"]]["lexical_score"] == 1.0